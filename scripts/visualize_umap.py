@@ -7,31 +7,46 @@ with colors derived from UMAP projection of Levenshtein distance matrix.
 """
 
 import argparse
+import mmap
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 from sklearn.preprocessing import MinMaxScaler
 from umap import UMAP
-import Levenshtein
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
 import warnings
 
 
 def read_fasta(fasta_path):
     """Read sequences from FASTA file."""
-    sequences = []
-    current_seq = []
-
-    with open(fasta_path) as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('>'):
-                if current_seq:
-                    sequences.append(''.join(current_seq))
-                    current_seq = []
-            else:
-                current_seq.append(line)
-        if current_seq:
-            sequences.append(''.join(current_seq))
+    with open(fasta_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Scan the whole file for header starts in one numpy pass, then
+            # slice each record out in bulk instead of walking it line by line
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            starts = np.flatnonzero(buf == ord('>'))
+            starts = starts[(starts == 0) | (buf[starts - 1] == ord('\n'))]
+
+            # Text before the first header is kept as a sequence of its own
+            if len(starts) == 0 or starts[0] != 0:
+                starts = np.insert(starts, 0, 0)
+
+            sequences = []
+            bounds = np.append(starts, len(buf))
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                if mm[start] == ord('>'):
+                    body = mm.find(b'\n', start, end)
+                    if body < 0:
+                        continue
+                    start = body + 1
+                seq = mm[start:end].translate(None, b' \t\r\n')
+                if seq:
+                    sequences.append(seq.decode('ascii'))
+            del buf
 
     return sequences
 
@@ -41,16 +56,13 @@ def compute_color_map(unique_sequences):
     n_unique = len(unique_sequences)
     print(f"  Computing distance matrix ({n_unique} x {n_unique})...")
 
-    # Build distance matrix
-    distance_matrix = np.zeros((n_unique, n_unique))
-    for i in range(n_unique):
-        for j in range(i + 1, n_unique):
-            dist = Levenshtein.distance(unique_sequences[i], unique_sequences[j])
-            distance_matrix[i, j] = dist
-            distance_matrix[j, i] = dist
-
-        if (i + 1) % 100 == 0:
-            print(f"    {i + 1}/{n_unique} rows...")
+    # Build distance matrix in one batched call (C, multithreaded)
+    distance_matrix = process.cdist(
+        unique_sequences, unique_sequences,
+        scorer=Levenshtein.distance,
+        dtype=np.float32,
+        workers=-1
+    )
 
     # Project to 3D RGB space using UMAP
     print(f"  Projecting to 3D color space using UMAP...")
@@ -105,22 +117,23 @@ def visualize_2d(sequences, color_map, output_path=None, grid_width=100, tile_si
 
     print(f"  Creating {grid_width}x{n_rows} grid...")
 
-    # Build RGB array
-    height_px = n_rows * tile_size
-    width_px = grid_width * tile_size
-    rgb_array = np.ones((height_px, width_px, 3)) * 0.15  # Dark background
-
-    for idx, seq in enumerate(sequences):
-        row = idx // grid_width
-        col = idx % grid_width
-
-        y_start = row * tile_size
-        y_end = (row + 1) * tile_size
-        x_start = col * tile_size
-        x_end = (col + 1) * tile_size
-
-        if seq in color_map:
-            rgb_array[y_start:y_end, x_start:x_end] = color_map[seq]
+    # Build RGB array: one colour-table gather for the whole grid, with the
+    # last table row as the dark background for padding and unmapped repeats.
+    # The table is 8-bit, so the grid and its tile expansion are built directly
+    # in the format imshow displays rather than as float64.
+    seq_to_id = {seq: i for i, seq in enumerate(color_map)}
+    colors = np.asarray(list(color_map.values()), dtype=np.float32).reshape(-1, 3)
+    color_table = np.vstack([np.rint(colors * 255).astype(np.uint8),
+                             np.full((1, 3), 38, dtype=np.uint8)])  # 0.15 * 255
+    background = len(color_table) - 1
+
+    ids = np.full(n_rows * grid_width, background, dtype=np.int32)
+    ids[:n_repeats] = np.fromiter((seq_to_id.get(seq, background) for seq in sequences),
+                                  dtype=np.int32, count=n_repeats)
+    rgb_array = color_table[ids].reshape(n_rows, grid_width, 3)
+
+    # Expand each repeat to a tile_size x tile_size block
+    rgb_array = np.repeat(np.repeat(rgb_array, tile_size, axis=0), tile_size, axis=1)
 
     # Create figure
     fig_width = max(12, grid_width * tile_size / 100)
@@ -82,12 +82,24 @@ static int claim_index(Batch *b) {
     return idx;
 }
 
+// Per-trajectory seed. xorshift32 is linear, so adjacent raw seeds (seed_base+i)
+// start out on visibly related streams; passing the index through a 32-bit
+// avalanche finaliser (murmur3 fmix32) gives every trajectory an independent
+// stream while staying deterministic for a given seed_base.
+static unsigned int trajectory_seed(unsigned int seed_base, int idx) {
+    unsigned int h = seed_base + (unsigned int)idx;
+    h ^= h >> 16; h *= 0x85EBCA6Bu;
+    h ^= h >> 13; h *= 0xC2B2AE35u;
+    h ^= h >> 16;
+    return h;
+}
+
 static void *worker_main(void *arg) {
     Batch *b = (Batch *)arg;
     int idx;
     while ((idx = claim_index(b)) >= 0) {
         Simulation sim;
-        sim_init(&sim, b->cfg.initial_size, b->cfg.seed_base + (unsigned int)idx);
+        sim_init(&sim, b->cfg.initial_size, trajectory_seed(b->cfg.seed_base, idx));
         sim.params = b->cfg.base_params;  // apply batch template; rng_state stays as seeded by sim_init
 
         long target = b->cfg.target_generations;
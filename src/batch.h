@@ -24,7 +24,7 @@ typedef struct {
     int          initial_size;
     long         target_generations;
     SimParams    base_params;     // mutation rates / distributions / bounding for every trajectory
-    unsigned int seed_base;       // trajectory i uses seed_base + i
+    unsigned int seed_base;       // trajectory i is seeded from mix(seed_base + i)
     int          nbins;           // histogram bin resolution (<=0 -> default 50)
 } BatchConfig;
 
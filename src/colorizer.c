@@ -1,11 +1,19 @@
 #include "colorizer.h"
 #include "config.h"
+#include "simulation.h"
 #include <stdlib.h>
 #include <string.h>
 #include <math.h>
+#include <stdbool.h>
+#include <pthread.h>
+#include <unistd.h>
 
 #define ENCODING_SIZE (REPEAT_SIZE * 4)  // 712
-#define CACHE_INITIAL_SIZE 4096
+#define CACHE_INITIAL_SIZE 4096  // must be a power of two (probes use hash & mask)
+// Batches with at least this many misses are projected across worker threads;
+// below it, thread start-up costs more than the projection itself.
+#define PARALLEL_MIN_MISSES 4096
+#define PARALLEL_MAX_THREADS 8
 
 // ============================================================================
 // Random number generation (same as simulation but separate state)
@@ -84,96 +92,75 @@ static void orthogonalize(float matrix[][3], int rows) {
 }
 
 // ============================================================================
-// One-hot encoding
+// Base encoding
 // ============================================================================
 
-static void one_hot_encode(const char *seq, float *out) {
-    memset(out, 0, ENCODING_SIZE * sizeof(float));
-
-    for (int i = 0; i < REPEAT_SIZE; i++) {
-        int base_idx;
-        switch (seq[i]) {
-            case 'A': base_idx = 0; break;
-            case 'C': base_idx = 1; break;
-            case 'G': base_idx = 2; break;
-            case 'T': base_idx = 3; break;
-            default: continue;
-        }
-        out[i * 4 + base_idx] = 1.0f;
-    }
-}
+// Byte -> base lookup, stored as index + 1 (A=1, C=2, G=3, T=4; 0 = not a base).
+// One table load per position instead of a per-base switch.
+static const unsigned char BASE_CODE[256] = { ['A'] = 1, ['C'] = 2, ['G'] = 3, ['T'] = 4 };
 
 // ============================================================================
-// Hashing for cache
+// Fixed bounds computation
 // ============================================================================
 
-static unsigned int hash_sequence(const char *seq) {
-    unsigned int hash = 2166136261u;
-    for (int i = 0; i < REPEAT_SIZE; i++) {
-        hash ^= (unsigned char)seq[i];
-        hash *= 16777619u;
-    }
-    return hash;
+static int compare_floats(const void *a, const void *b) {
+    float fa = *(const float *)a, fb = *(const float *)b;
+    return (fa > fb) - (fa < fb);
 }
 
-// ============================================================================
-// Fixed bounds computation
-// ============================================================================
-
 static void compute_fixed_bounds(Colorizer *c) {
-    // Sample random sequences to estimate the range
-    int n_samples = 1000;
-    float *raw = (float *)malloc(n_samples * 3 * sizeof(float));
-    float encoding[ENCODING_SIZE];
+    // Sample random sequences to estimate the range. Samples are stored
+    // channel-major, so each channel is already a contiguous array to sort.
+    enum { n_samples = 1000 };
+    float samples[3][n_samples];
 
     col_rng_seed(col_rng_state + 1000);  // Different seed for sampling
 
     for (int s = 0; s < n_samples; s++) {
-        // Generate random sequence
-        char seq[REPEAT_SIZE + 1];
+        // Draw a random sequence as base indices and project it in the same
+        // loop: no string is built or re-encoded, just one row gather per draw.
+        float acc[3] = {0.0f, 0.0f, 0.0f};
         for (int i = 0; i < REPEAT_SIZE; i++) {
             col_rng_state ^= col_rng_state << 13;
             col_rng_state ^= col_rng_state >> 17;
             col_rng_state ^= col_rng_state << 5;
-            seq[i] = BASES[col_rng_state % 4];
-        }
-        seq[REPEAT_SIZE] = '\0';
-
-        // Encode and project
-        one_hot_encode(seq, encoding);
-        for (int ch = 0; ch < 3; ch++) {
-            float val = 0.0f;
-            for (int j = 0; j < ENCODING_SIZE; j++) {
-                val += encoding[j] * c->projection[j][ch];
-            }
-            raw[s * 3 + ch] = val;
+            const float *p = c->projection[i][col_rng_state % 4];
+            acc[0] += p[0];
+            acc[1] += p[1];
+            acc[2] += p[2];
         }
+        for (int ch = 0; ch < 3; ch++) samples[ch][s] = acc[ch];
     }
 
     // Sort each channel and use percentiles
     for (int ch = 0; ch < 3; ch++) {
-        float channel_vals[1000];
-        for (int s = 0; s < n_samples; s++) {
-            channel_vals[s] = raw[s * 3 + ch];
-        }
+        float *channel_vals = samples[ch];
 
-        // Simple bubble sort (only 1000 elements)
-        for (int i = 0; i < n_samples - 1; i++) {
-            for (int j = 0; j < n_samples - i - 1; j++) {
-                if (channel_vals[j] > channel_vals[j + 1]) {
-                    float tmp = channel_vals[j];
-                    channel_vals[j] = channel_vals[j + 1];
-                    channel_vals[j + 1] = tmp;
-                }
-            }
-        }
+        // qsort rather than a quadratic sort: ~10k compares per channel instead of ~500k
+        qsort(channel_vals, n_samples, sizeof(float), compare_floats);
 
         // 1st and 99th percentile with padding
         c->min_vals[ch] = channel_vals[10] - 0.5f;
         c->max_vals[ch] = channel_vals[989] + 0.5f;
     }
 
-    free(raw);
+    // Fold 255 * (x - min) / range into the matrix once, so each colour is a
+    // single affine transform: bias + sum of scaled rows, in 8-bit units.
+    float scale[3];
+    for (int ch = 0; ch < 3; ch++) {
+        float range = c->max_vals[ch] - c->min_vals[ch];
+        scale[ch] = 255.0f / ((range > 0) ? range : 1.0f);
+        c->bias[ch] = -c->min_vals[ch] * scale[ch];
+    }
+    c->bias[3] = 0.0f;
+    memset(c->proj_norm, 0, sizeof(c->proj_norm));
+    for (int i = 0; i < REPEAT_SIZE; i++) {
+        for (int b = 0; b < 4; b++) {
+            for (int ch = 0; ch < 3; ch++) {
+                c->proj_norm[i][b + 1][ch] = c->projection[i][b][ch] * scale[ch];
+            }
+        }
+    }
 }
 
 // ============================================================================
@@ -183,15 +170,16 @@ static void compute_fixed_bounds(Colorizer *c) {
 void colorizer_init(Colorizer *c, unsigned int seed) {
     col_rng_seed(seed);
 
-    // Generate random Gaussian matrix
+    // Generate random Gaussian matrix (flat 712x3 view of the (position, base) table)
+    float (*matrix)[3] = (float (*)[3])c->projection;
     for (int row = 0; row < ENCODING_SIZE; row++) {
         for (int col = 0; col < 3; col++) {
-            c->projection[row][col] = col_rng_gauss();
+            matrix[row][col] = col_rng_gauss();
         }
     }
 
     // Orthogonalize
-    orthogonalize(c->projection, ENCODING_SIZE);
+    orthogonalize(matrix, ENCODING_SIZE);
 
     // Compute fixed bounds
     compute_fixed_bounds(c);
@@ -199,76 +187,214 @@ void colorizer_init(Colorizer *c, unsigned int seed) {
     // Initialize cache
     c->cache_capacity = CACHE_INITIAL_SIZE;
     c->cache_size = 0;
-    c->cache_hashes = (unsigned int *)calloc(c->cache_capacity, sizeof(unsigned int));
-    c->cache_colors = (Color *)malloc(c->cache_capacity * sizeof(Color));
+    c->cache = (ColorCacheEntry *)calloc(c->cache_capacity, sizeof(ColorCacheEntry));
 }
 
 void colorizer_free(Colorizer *c) {
-    free(c->cache_hashes);
-    free(c->cache_colors);
-    c->cache_hashes = NULL;
-    c->cache_colors = NULL;
+    free(c->cache);
+    c->cache = NULL;
     c->cache_size = 0;
     c->cache_capacity = 0;
 }
 
 void colorizer_clear_cache(Colorizer *c) {
-    memset(c->cache_hashes, 0, c->cache_capacity * sizeof(unsigned int));
+    memset(c->cache, 0, c->cache_capacity * sizeof(ColorCacheEntry));
     c->cache_size = 0;
 }
 
-Color colorizer_get_color(Colorizer *c, const char *seq) {
-    unsigned int hash = hash_sequence(seq);
-
-    // Check cache
-    unsigned int idx = hash % c->cache_capacity;
-    int probes = 0;
-    while (c->cache_hashes[idx] != 0 && probes < c->cache_capacity) {
-        if (c->cache_hashes[idx] == hash) {
-            return c->cache_colors[idx];
+// Look `hash` up in the cache. Returns true and fills *out on a hit. The table
+// is never more than 3/4 full, so the probe always reaches an empty slot.
+static bool cache_lookup(const Colorizer *c, unsigned int hash, Color *out) {
+    unsigned int mask = (unsigned int)c->cache_capacity - 1;
+    unsigned int idx = hash & mask;
+    while (c->cache[idx].hash != 0) {
+        if (c->cache[idx].hash == hash) {
+            *out = c->cache[idx].color;
+            return true;
         }
-        idx = (idx + 1) % c->cache_capacity;
-        probes++;
+        idx = (idx + 1) & mask;
+    }
+    return false;
+}
+
+// Place an entry known not to be in the table (no load check).
+static void cache_place(ColorCacheEntry *table, unsigned int mask, unsigned int hash, Color color) {
+    unsigned int idx = hash & mask;
+    while (table[idx].hash != 0) idx = (idx + 1) & mask;
+    table[idx].hash = hash;
+    table[idx].color = color;
+}
+
+// Double the table and rehash every entry into it.
+static bool cache_grow(Colorizer *c) {
+    int new_capacity = c->cache_capacity * 2;
+    ColorCacheEntry *table = (ColorCacheEntry *)calloc(new_capacity, sizeof(ColorCacheEntry));
+    if (!table) return false;
+    unsigned int mask = (unsigned int)new_capacity - 1;
+    for (int i = 0; i < c->cache_capacity; i++) {
+        if (c->cache[i].hash != 0) cache_place(table, mask, c->cache[i].hash, c->cache[i].color);
+    }
+    free(c->cache);
+    c->cache = table;
+    c->cache_capacity = new_capacity;
+    return true;
+}
+
+static void cache_insert(Colorizer *c, unsigned int hash, Color color) {
+    // hash 0 marks an empty slot, so that one sequence is simply never cached
+    if (hash == 0) return;
+
+    unsigned int mask = (unsigned int)c->cache_capacity - 1;
+    unsigned int idx = hash & mask;
+    while (c->cache[idx].hash != 0) {
+        if (c->cache[idx].hash == hash) return;  // already cached
+        idx = (idx + 1) & mask;
     }
 
+    // Grow at 3/4 load rather than stop caching: a long run accumulates far
+    // more distinct units than the initial table holds, and every uncached
+    // unit would be re-projected on every redraw.
+    if ((c->cache_size + 1) * 4 > c->cache_capacity * 3) {
+        if (!cache_grow(c)) return;
+        cache_place(c->cache, (unsigned int)c->cache_capacity - 1, hash, color);
+    } else {
+        c->cache[idx].hash = hash;
+        c->cache[idx].color = color;
+    }
+    c->cache_size++;
+}
+
+// Clamp to 0..255 with plain comparisons: these compile to maxss/minss, where
+// fminf/fmaxf become library calls without -ffast-math.
+static inline unsigned char clamp_channel(float v) {
+    v = v > 0.0f ? v : 0.0f;
+    v = v < 255.0f ? v : 255.0f;
+    return (unsigned char)v;
+}
+
+// Colour kernel: project one REPEAT_SIZE-byte sequence straight from its bytes.
+// The 712-d encoding is one-hot, so the 712x3 product is a sum of one
+// (position, base) row per position: 178 gathers instead of 712 multiply-adds
+// with 3/4 of them against zero. The rows come from proj_norm, so the sum is
+// already normalised to 0..255; only the clamp and packing remain. Every unit
+// the simulation produces is exactly REPEAT_SIZE bytes, so the loop bound is a
+// compile-time constant with no per-call length handling.
+static inline Color project_seq(const Colorizer *c, const unsigned char *seq) {
+    float acc[4] = {c->bias[0], c->bias[1], c->bias[2], c->bias[3]};
+    for (int i = 0; i < REPEAT_SIZE; i++) {
+        const float *p = c->proj_norm[i][BASE_CODE[seq[i]]];
+        for (int ch = 0; ch < 4; ch++) acc[ch] += p[ch];
+    }
+    return (Color){ clamp_channel(acc[0]), clamp_channel(acc[1]), clamp_channel(acc[2]), 255 };
+}
+
+// Project seqs[rows[r]] into out[r] for r in [0, n).
+static void project_rows(const Colorizer *c, const char *const *seqs, const int *rows,
+                         int n, Color *out) {
+    for (int r = 0; r < n; r++) {
+        out[r] = project_seq(c, (const unsigned char *)seqs[rows[r]]);
+    }
+}
+
+// One worker's slice of a parallel project_rows call.
+typedef struct {
+    const Colorizer *c;
+    const char *const *seqs;
+    const int *rows;
+    int n;
+    Color *out;
+} ProjectJob;
+
+static void *project_worker(void *arg) {
+    ProjectJob *job = (ProjectJob *)arg;
+    project_rows(job->c, job->seqs, job->rows, job->n, job->out);
+    return NULL;
+}
+
+// project_rows split into contiguous slices across threads. Every row is
+// independent and the kernel only reads the Colorizer, so no locking is needed.
+static void project_rows_parallel(const Colorizer *c, const char *const *seqs, const int *rows,
+                                  int n, Color *out) {
+    long ncpu = sysconf(_SC_NPROCESSORS_ONLN);
+    int nthreads = (ncpu > 0) ? (int)ncpu : 1;
+    if (nthreads > PARALLEL_MAX_THREADS) nthreads = PARALLEL_MAX_THREADS;
+    if (n < PARALLEL_MIN_MISSES || nthreads < 2) {
+        project_rows(c, seqs, rows, n, out);
+        return;
+    }
+
+    pthread_t threads[PARALLEL_MAX_THREADS];
+    ProjectJob jobs[PARALLEL_MAX_THREADS];
+    int per = (n + nthreads - 1) / nthreads;
+    for (int t = 0; t < nthreads; t++) {
+        int start = t * per;
+        int count = (start + per <= n) ? per : n - start;
+        if (count < 0) count = 0;
+        jobs[t] = (ProjectJob){ c, seqs, rows + start, count, out + start };
+    }
+    // The calling thread takes slice 0; fall back to running a slice inline
+    // if a thread can't be started.
+    bool started[PARALLEL_MAX_THREADS] = { false };
+    for (int t = 1; t < nthreads; t++) {
+        started[t] = pthread_create(&threads[t], NULL, project_worker, &jobs[t]) == 0;
+        if (!started[t]) project_worker(&jobs[t]);
+    }
+    project_worker(&jobs[0]);
+    for (int t = 1; t < nthreads; t++) {
+        if (started[t]) pthread_join(threads[t], NULL);
+    }
+}
+
+Color colorizer_get_color(Colorizer *c, const char *seq) {
+    unsigned int hash = sim_hash_unit(seq);
+
+    Color color;
+    if (cache_lookup(c, hash, &color)) return color;
+
     // Not in cache - compute color
-    float encoding[ENCODING_SIZE];
-    one_hot_encode(seq, encoding);
+    color = project_seq(c, (const unsigned char *)seq);
+    cache_insert(c, hash, color);
+    return color;
+}
 
-    float rgb[3];
-    for (int ch = 0; ch < 3; ch++) {
-        float val = 0.0f;
-        for (int j = 0; j < ENCODING_SIZE; j++) {
-            val += encoding[j] * c->projection[j][ch];
+void colorizer_get_colors(Colorizer *c, char *const *seqs, const unsigned int *hashes,
+                          int n, Color *out) {
+    if (n <= 0) return;
+
+    // Pass 1: resolve cache hits, queue the misses. Misses are rare once the
+    // array has been drawn once (most units survive between redraws).
+    int *miss = (int *)malloc((size_t)n * sizeof(int));
+    unsigned int *miss_hash = (unsigned int *)malloc((size_t)n * sizeof(unsigned int));
+    int n_miss = 0;
+    unsigned int prev_hash = 0;
+    bool prev_hit = false;
+    for (int i = 0; i < n; i++) {
+        unsigned int hash = hashes ? hashes[i] : sim_hash_unit(seqs[i]);
+        // Tandem arrays are mostly runs of identical units: reuse the colour
+        // just resolved for the previous unit instead of probing the cache.
+        if (prev_hit && hash == prev_hash) {
+            out[i] = out[i - 1];
+            continue;
         }
-
-        // Normalize to [0, 1]
-        float range = c->max_vals[ch] - c->min_vals[ch];
-        if (range > 0) {
-            val = (val - c->min_vals[ch]) / range;
+        prev_hash = hash;
+        prev_hit = cache_lookup(c, hash, &out[i]);
+        if (!prev_hit) {
+            miss[n_miss] = i;
+            miss_hash[n_miss] = hash;
+            n_miss++;
         }
-        if (val < 0) val = 0;
-        if (val > 1) val = 1;
-        rgb[ch] = val;
     }
 
-    Color color = {
-        (unsigned char)(rgb[0] * 255),
-        (unsigned char)(rgb[1] * 255),
-        (unsigned char)(rgb[2] * 255),
-        255
-    };
-
-    // Add to cache if there's room
-    if (c->cache_size < c->cache_capacity * 3 / 4) {
-        idx = hash % c->cache_capacity;
-        while (c->cache_hashes[idx] != 0) {
-            idx = (idx + 1) % c->cache_capacity;
-        }
-        c->cache_hashes[idx] = hash;
-        c->cache_colors[idx] = color;
-        c->cache_size++;
+    // Pass 2: project every miss in one kernel call (threaded for large batches,
+    // e.g. the first draw of a big array), then publish them to the cache.
+    Color *fresh = (Color *)malloc((size_t)(n_miss > 0 ? n_miss : 1) * sizeof(Color));
+    project_rows_parallel(c, (const char *const *)seqs, miss, n_miss, fresh);
+    for (int m = 0; m < n_miss; m++) {
+        out[miss[m]] = fresh[m];
+        cache_insert(c, miss_hash[m], fresh[m]);
     }
+    free(fresh);
 
-    return color;
+    free(miss);
+    free(miss_hash);
 }
@@ -3,15 +3,28 @@
 
 #include <raylib.h>
 
+// One colour-cache slot: the sequence hash and its colour side by side, so a
+// probe touches a single 8-byte entry. hash == 0 marks an empty slot.
+typedef struct {
+    unsigned int hash;
+    Color color;
+} ColorCacheEntry;
+
 // Orthogonal projection colorizer
 typedef struct {
-    float projection[712][3];  // 178*4 x 3 orthogonal matrix
+    float projection[178][4][3];  // 178*4 x 3 orthogonal matrix, indexed (position, base)
     float min_vals[3];         // Fixed normalization bounds
     float max_vals[3];
+    // Normalisation folded into the projection: colour = bias + sum of
+    // proj_norm rows, already scaled to [0, 255] before clamping. Indexed by
+    // base code (0 = not a base, an all-zero row; 1..4 = A, C, G, T) so the
+    // kernel needs no branch, and padded to 4 floats (last lane 0) so each
+    // gather+add is one 16-byte vector op.
+    float proj_norm[178][5][4];
+    float bias[4];
 
     // Color cache (simple hash table)
-    unsigned int *cache_hashes;
-    Color *cache_colors;
+    ColorCacheEntry *cache;
     int cache_size;
     int cache_capacity;
 } Colorizer;
@@ -19,6 +32,12 @@ typedef struct {
 void colorizer_init(Colorizer *c, unsigned int seed);
 void colorizer_free(Colorizer *c);
 Color colorizer_get_color(Colorizer *c, const char *seq);
+// Batch form: colour seqs[0..n) into out[0..n). Cache hits are resolved first and
+// the misses projected together, so redrawing a whole grid is one call.
+// `hashes` may carry the precomputed FNV-1a hash of each sequence (see
+// sim_hash_units); pass NULL to hash here.
+void colorizer_get_colors(Colorizer *c, char *const *seqs, const unsigned int *hashes,
+                          int n, Color *out);
 void colorizer_clear_cache(Colorizer *c);
 
 #endif // COLORIZER_H
@@ -41,16 +41,6 @@ static int hamming(const char *a, const char *b) {
 static int hamming(const char *a, const char *b) { return hamming_scalar(a, b); }
 #endif
 
-// FNV-1a over a unit; used to count unique sequences within a block cheaply.
-static unsigned int unit_hash(const char *seq) {
-    unsigned int h = 2166136261u;
-    for (int i = 0; i < REPEAT_SIZE; i++) {
-        h ^= (unsigned char)seq[i];
-        h *= 16777619u;
-    }
-    return h;
-}
-
 // Count distinct units in block [start, start+len) using precomputed per-unit
 // hashes, via an open-addressing hash set with linear probing: O(len), no sort.
 // 0 is the empty slot; an actual hash of 0 is tracked separately. Hash collisions
@@ -98,7 +88,7 @@ static HorBlock make_block(const unsigned int *hashes, int aStart, int run, int
 // these instead of re-hashing the same units hundreds of millions of times).
 static unsigned int *precompute_hashes(char **units, int n) {
     unsigned int *hashes = (unsigned int *)malloc((size_t)n * sizeof(unsigned int));
-    for (int i = 0; i < n; i++) hashes[i] = unit_hash(units[i]);
+    for (int i = 0; i < n; i++) hashes[i] = sim_hash_unit(units[i]);
     return hashes;
 }
 
@@ -4,6 +4,8 @@
 #include <unistd.h>
 #include <time.h>
 #include <math.h>
+#include <pthread.h>
+#include <sys/stat.h>
 
 #include <raylib.h>
 
@@ -61,19 +63,24 @@ static int MeasureTextS(const char *t, int size) {
 // ============================================================================
 
 #define HISTORY_MAX 1000  // Max data points to store
+// Backing storage is twice the window: the visible samples are [head, head+count),
+// and the window only slides back to the front when it reaches the end, so a full
+// history costs one memmove per HISTORY_MAX samples instead of one per sample.
+#define HISTORY_BUF (HISTORY_MAX * 2)
 
 typedef struct {
-    int generation[HISTORY_MAX];
-    float diversity[HISTORY_MAX];
-    int unique[HISTORY_MAX];
-    int array_size[HISTORY_MAX];
+    int generation[HISTORY_BUF];
+    float diversity[HISTORY_BUF];
+    int unique[HISTORY_BUF];
+    int array_size[HISTORY_BUF];
     // Measured (realized) dup/del statistics over each sample interval -- these can
     // diverge from the theoretical values derived from the ratio because of the
     // size floor (0-size no-ops), placement skips and hard bounds.
-    float m_dup_size[HISTORY_MAX];  // units per duplication event
-    float m_del_size[HISTORY_MAX];  // units per deletion event
-    float m_dup_rate[HISTORY_MAX];  // duplication events per generation
-    float m_del_rate[HISTORY_MAX];  // deletion events per generation
+    float m_dup_size[HISTORY_BUF];  // units per duplication event
+    float m_del_size[HISTORY_BUF];  // units per deletion event
+    float m_dup_rate[HISTORY_BUF];  // duplication events per generation
+    float m_del_rate[HISTORY_BUF];  // deletion events per generation
+    int head;   // index of the oldest visible sample
     int count;
     int sample_interval;  // Sample every N generations
     int last_sampled_gen;
@@ -83,6 +90,7 @@ typedef struct {
 } StatsHistory;
 
 static void history_init(StatsHistory *h) {
+    h->head = 0;
     h->count = 0;
     h->sample_interval = 100;
     h->last_sampled_gen = -1;
@@ -91,17 +99,19 @@ static void history_init(StatsHistory *h) {
 }
 
 static void history_clear(StatsHistory *h) {
+    h->head = 0;
     h->count = 0;
     h->last_sampled_gen = -1;
     h->last_dup_count = h->last_del_count = 0;
     h->last_dup_units = h->last_del_units = 0;
 }
 
-static void history_record(StatsHistory *h, Simulation *sim) {
+// `unique` is the caller's current unique-unit count for sim (the frame's
+// cached_unique), so sampling doesn't rescan the whole array a second time.
+static void history_record(StatsHistory *h, Simulation *sim, int unique) {
     // Only sample at intervals to avoid too many points
     if (sim->stats.generation - h->last_sampled_gen < h->sample_interval) return;
 
-    int unique = sim_count_unique(sim);
     float diversity = (sim->array.num_units > 0)
         ? (float)unique / (float)sim->array.num_units : 0.0f;
 
@@ -117,29 +127,34 @@ static void history_record(StatsHistory *h, Simulation *sim) {
     float m_dup_rate = (float)d_dup_ev / dgen;
     float m_del_rate = (float)d_del_ev / dgen;
 
-    // Shift data if buffer full
+    // Window full: drop the oldest sample
     if (h->count >= HISTORY_MAX) {
-        for (int i = 0; i < HISTORY_MAX - 1; i++) {
-            h->generation[i] = h->generation[i + 1];
-            h->diversity[i] = h->diversity[i + 1];
-            h->unique[i] = h->unique[i + 1];
-            h->array_size[i] = h->array_size[i + 1];
-            h->m_dup_size[i] = h->m_dup_size[i + 1];
-            h->m_del_size[i] = h->m_del_size[i + 1];
-            h->m_dup_rate[i] = h->m_dup_rate[i + 1];
-            h->m_del_rate[i] = h->m_del_rate[i + 1];
-        }
+        h->head++;
         h->count = HISTORY_MAX - 1;
     }
+    // Reached the end of the storage: slide the window back to the front
+    if (h->head + h->count >= HISTORY_BUF) {
+        int n = h->count, s = h->head;
+        memmove(h->generation, h->generation + s, n * sizeof(h->generation[0]));
+        memmove(h->diversity,  h->diversity + s,  n * sizeof(h->diversity[0]));
+        memmove(h->unique,     h->unique + s,     n * sizeof(h->unique[0]));
+        memmove(h->array_size, h->array_size + s, n * sizeof(h->array_size[0]));
+        memmove(h->m_dup_size, h->m_dup_size + s, n * sizeof(h->m_dup_size[0]));
+        memmove(h->m_del_size, h->m_del_size + s, n * sizeof(h->m_del_size[0]));
+        memmove(h->m_dup_rate, h->m_dup_rate + s, n * sizeof(h->m_dup_rate[0]));
+        memmove(h->m_del_rate, h->m_del_rate + s, n * sizeof(h->m_del_rate[0]));
+        h->head = 0;
+    }
 
-    h->generation[h->count] = sim->stats.generation;
-    h->diversity[h->count] = diversity;
-    h->unique[h->count] = unique;
-    h->array_size[h->count] = sim->array.num_units;
-    h->m_dup_size[h->count] = m_dup_size;
-    h->m_del_size[h->count] = m_del_size;
-    h->m_dup_rate[h->count] = m_dup_rate;
-    h->m_del_rate[h->count] = m_del_rate;
+    int i = h->head + h->count;
+    h->generation[i] = sim->stats.generation;
+    h->diversity[i] = diversity;
+    h->unique[i] = unique;
+    h->array_size[i] = sim->array.num_units;
+    h->m_dup_size[i] = m_dup_size;
+    h->m_del_size[i] = m_del_size;
+    h->m_dup_rate[i] = m_dup_rate;
+    h->m_del_rate[i] = m_del_rate;
     h->count++;
     h->last_sampled_gen = sim->stats.generation;
     h->last_dup_count = sim->stats.dup_count;
@@ -289,13 +304,13 @@ static void draw_measure_cluster(const StatsHistory *h, const Simulation *sim, i
 
     DrawTextS("MEASURED vs THEORY (dup/del)", x, y - 13, 10, (Color){150, 170, 150, 255});
     draw_measure_plot((Rectangle){x,              y,            pw, ph}, "DUP SIZE (u/event)",
-                      h->m_dup_size, h->count, th_dup_size, DUP);
+                      h->m_dup_size + h->head, h->count, th_dup_size, DUP);
     draw_measure_plot((Rectangle){x + pw + gap,   y,            pw, ph}, "DEL SIZE (u/event)",
-                      h->m_del_size, h->count, th_del_size, DEL);
+                      h->m_del_size + h->head, h->count, th_del_size, DEL);
     draw_measure_plot((Rectangle){x,              y + ph + gap, pw, ph}, "DUP RATE (ev/gen)",
-                      h->m_dup_rate, h->count, th_dup_rate, DUP);
+                      h->m_dup_rate + h->head, h->count, th_dup_rate, DUP);
     draw_measure_plot((Rectangle){x + pw + gap,   y + ph + gap, pw, ph}, "DEL RATE (ev/gen)",
-                      h->m_del_rate, h->count, th_del_rate, DEL);
+                      h->m_del_rate + h->head, h->count, th_del_rate, DEL);
 }
 
 // Draw the mission control panel
@@ -326,20 +341,78 @@ static void draw_mission_control(StatsHistory *h, int screen_width, int screen_h
 
     // Diversity plot (green)
     Rectangle div_rect = {plot_margin, plot_top, plot_width, plot_height};
-    draw_plot(div_rect, "DIVERSITY", h->diversity, h->count, 0.0f, 1.0f,
+    draw_plot(div_rect, "DIVERSITY", h->diversity + h->head, h->count, 0.0f, 1.0f,
               (Color){0, 255, 100, 255}, (Color){0, 150, 60, 255});
 
     // Unique repeats plot (cyan)
     Rectangle uniq_rect = {plot_margin * 2 + plot_width, plot_top, plot_width, plot_height};
-    draw_plot_int(uniq_rect, "UNIQUE SEQS", h->unique, h->count, 0, 0,
+    draw_plot_int(uniq_rect, "UNIQUE SEQS", h->unique + h->head, h->count, 0, 0,
                   (Color){0, 220, 255, 255}, (Color){0, 120, 150, 255});
 
     // Array size plot (amber/orange)
     Rectangle size_rect = {plot_margin * 3 + plot_width * 2, plot_top, plot_width, plot_height};
-    draw_plot_int(size_rect, "ARRAY SIZE", h->array_size, h->count, 0, 0,
+    draw_plot_int(size_rect, "ARRAY SIZE", h->array_size + h->head, h->count, 0, 0,
                   (Color){255, 180, 0, 255}, (Color){150, 100, 0, 255});
 }
 
+// The mission-control panel rendered once into a texture and re-rendered only
+// when a new history sample lands or its layout changes. The three plots are a
+// few thousand line segments, so every other frame just blits the texture.
+typedef struct {
+    RenderTexture2D rt;
+    bool  valid;
+    int   head, count, last_gen;           // history state it was drawn from
+    int   width, height, theme;            // layout it was drawn for
+    float scale;
+    bool  minimized;
+} PlotCache;
+
+static PlotCache g_mc_cache;
+
+static void mission_control_cache_update(StatsHistory *h, int screen_width, int panel_height,
+                                         bool minimized, int ctrl_panel_width) {
+    PlotCache *c = &g_mc_cache;
+    int width = screen_width - ctrl_panel_width;
+    if (width < 1 || panel_height < 1) return;
+
+    if (c->valid && c->head == h->head && c->count == h->count &&
+        c->last_gen == h->last_sampled_gen && c->width == width &&
+        c->height == panel_height && c->theme == g_theme_idx &&
+        c->scale == g_ui_scale && c->minimized == minimized) return;
+
+    if (!c->valid || c->width != width || c->height != panel_height) {
+        if (c->rt.id != 0) UnloadRenderTexture(c->rt);
+        c->rt = LoadRenderTexture(width, panel_height);
+    }
+
+    // Drawn as if the screen ended at the panel's bottom edge, so panel_y is 0
+    BeginTextureMode(c->rt);
+        ClearBackground(BLANK);
+        draw_mission_control(h, screen_width, panel_height, panel_height, minimized, ctrl_panel_width);
+        // Alpha blending leaves the texture's alpha below 1 wherever translucent
+        // lines or glyph edges landed; the panel is opaque, so force it back to 1
+        // (additive blend of a zero-colour, full-alpha rect leaves RGB untouched).
+        BeginBlendMode(BLEND_ADD_COLORS);
+            DrawRectangle(0, 0, width, panel_height, (Color){ 0, 0, 0, 255 });
+        EndBlendMode();
+    EndTextureMode();
+
+    c->valid = true;
+    c->head = h->head;
+    c->count = h->count;
+    c->last_gen = h->last_sampled_gen;
+    c->width = width;
+    c->height = panel_height;
+    c->theme = g_theme_idx;
+    c->scale = g_ui_scale;
+    c->minimized = minimized;
+}
+
+static void mission_control_cache_free(void) {
+    if (g_mc_cache.rt.id != 0) UnloadRenderTexture(g_mc_cache.rt);
+    g_mc_cache = (PlotCache){ 0 };
+}
+
 // ============================================================================
 // Resource path helpers (for app bundle support)
 // ============================================================================
@@ -377,6 +450,25 @@ static void get_umap_command(char *cmd, size_t cmd_size, const char *fasta_path,
     }
 }
 
+// Run a dialog command and place the first line it prints (the chosen path) in
+// `out`. Returns false if it printed nothing, i.e. the user cancelled.
+static bool read_dialog_path(const char *cmd, char *out, size_t out_size) {
+    FILE *pipe = popen(cmd, "r");
+    if (!pipe) return false;
+
+    char path[1024] = {0};
+    bool ok = false;
+    if (fgets(path, sizeof(path), pipe)) {
+        path[strcspn(path, "\n")] = 0;
+        if (strlen(path) > 0) {
+            snprintf(out, out_size, "%s", path);
+            ok = true;
+        }
+    }
+    pclose(pipe);
+    return ok;
+}
+
 // Open a native "save file" dialog and place the chosen path in `out`.
 // Returns true if a path was selected/derived, false if the user cancelled.
 // macOS uses osascript; Linux prefers zenity (GNOME) then kdialog (KDE), and
@@ -406,20 +498,32 @@ static bool get_save_fasta_path(char *out, size_t out_size, int generation) {
     }
 #endif
 
-    FILE *pipe = popen(cmd, "r");
-    if (!pipe) return false;
+    return read_dialog_path(cmd, out, out_size);
+}
 
-    char path[1024] = {0};
-    bool ok = false;
-    if (fgets(path, sizeof(path), pipe)) {
-        path[strcspn(path, "\n")] = 0;
-        if (strlen(path) > 0) {
-            snprintf(out, out_size, "%s", path);
-            ok = true;
-        }
+// Open a native "choose folder" dialog for the Save frames export and place the
+// chosen directory in `out`. Returns false if the user cancelled. Without a
+// dialog utility it falls back to $HOME: a bundle launched from Finder runs
+// with `/` as its working directory, which isn't writable.
+static bool get_frames_dir(char *out, size_t out_size) {
+    char cmd[512];
+#ifdef __APPLE__
+    snprintf(cmd, sizeof(cmd),
+        "osascript -e 'POSIX path of (choose folder with prompt \"Save frames into:\")' 2>/dev/null");
+#else
+    if (system("command -v zenity >/dev/null 2>&1") == 0) {
+        snprintf(cmd, sizeof(cmd),
+            "zenity --file-selection --directory --title=\"Save frames into\" 2>/dev/null");
+    } else if (system("command -v kdialog >/dev/null 2>&1") == 0) {
+        snprintf(cmd, sizeof(cmd), "kdialog --getexistingdirectory \".\" 2>/dev/null");
+    } else {
+        const char *home = getenv("HOME");
+        snprintf(out, out_size, "%s", (home && *home) ? home : ".");
+        return true;
     }
-    pclose(pipe);
-    return ok;
+#endif
+
+    return read_dialog_path(cmd, out, out_size);
 }
 
 #define RAYGUI_IMPLEMENTATION
@@ -431,6 +535,25 @@ static bool get_save_fasta_path(char *out, size_t out_size, int generation) {
 #include "dashboard.h"
 #include "stained_glass.h"
 
+// Write the array as FASTA (one ">repeat_N" record per unit). Each record is
+// assembled in a small buffer and written with one fwrite: units are always
+// REPEAT_SIZE bytes, so they're copied rather than scanned by printf's %s.
+static bool write_fasta(const char *path, const Simulation *sim) {
+    FILE *f = fopen(path, "w");
+    if (!f) return false;
+    setvbuf(f, NULL, _IOFBF, 1 << 20);
+
+    char rec[32 + REPEAT_SIZE + 1];
+    for (int i = 0; i < sim->array.num_units; i++) {
+        int len = snprintf(rec, 32, ">repeat_%d\n", i + 1);
+        memcpy(rec + len, sim->array.units[i], REPEAT_SIZE);
+        len += REPEAT_SIZE;
+        rec[len++] = '\n';
+        fwrite(rec, 1, (size_t)len, f);
+    }
+    return fclose(f) == 0;
+}
+
 // Apply a colour-scheme preset: copy its colours into g_theme and push the
 // chrome colours into raygui + the stained-glass palette.
 static void apply_theme(int idx, StainedGlass *sg) {
@@ -525,10 +648,159 @@ static void draw_options_ui(int sw, int sh, StainedGlass *sg) {
 // Grid rendering
 // ============================================================================
 
-static void draw_grid(Simulation *sim, Colorizer *colorizer, int offset_x, int offset_y,
-                      int grid_width, int max_units) {
+// While the simulation runs, the grid (hashes, unique count, colours, tile
+// repaint) is rebuilt at most this often. The simulation itself still advances
+// every frame; only the redraw of its state is rate-limited.
+#define GRID_REDRAW_HZ 30.0
+
+// Wall-clock time (seconds) one frame may spend in sim_run. Gens/frame is the
+// target; when the array is large enough that it would overrun this, fewer
+// generations run per frame so input and drawing never stall behind the sim.
+#define SIM_FRAME_BUDGET 0.016
+
+// Per-redraw unit hashes and tile colours. Kept across frames and grown on
+// demand, so a redraw does no allocation once the array size has settled.
+// `colors` is the per-unit palette: entries below `colored` hold the colour of
+// the unit hash recorded beside them in `color_hashes`. A colour is a function
+// of the hash alone, so wherever a position's hash is unchanged since the last
+// redraw (every tile on a re-layout, most of them after a generation) its colour
+// is reused without going back to the colorizer. `drawn` mirrors what the grid
+// texture currently holds, so an array change repaints only the tiles whose
+// colour actually differs.
+typedef struct {
+    unsigned int *hashes;
+    unsigned int *color_hashes;
+    Color *colors;
+    Color *drawn;
+    int capacity;
+    int colored;
+    int drawn_count;
+} GridScratch;
+
+static GridScratch g_grid_scratch;
+
+static void grid_scratch_reserve(int n) {
+    if (n <= g_grid_scratch.capacity) return;
+    int cap = g_grid_scratch.capacity > 0 ? g_grid_scratch.capacity : 1024;
+    while (cap < n) cap *= 2;
+    g_grid_scratch.hashes = (unsigned int *)realloc(g_grid_scratch.hashes, (size_t)cap * sizeof(unsigned int));
+    g_grid_scratch.color_hashes = (unsigned int *)realloc(g_grid_scratch.color_hashes, (size_t)cap * sizeof(unsigned int));
+    g_grid_scratch.colors = (Color *)realloc(g_grid_scratch.colors, (size_t)cap * sizeof(Color));
+    g_grid_scratch.drawn  = (Color *)realloc(g_grid_scratch.drawn,  (size_t)cap * sizeof(Color));
+    g_grid_scratch.capacity = cap;
+}
+
+static void grid_scratch_free(void) {
+    free(g_grid_scratch.hashes);
+    free(g_grid_scratch.color_hashes);
+    free(g_grid_scratch.colors);
+    free(g_grid_scratch.drawn);
+    g_grid_scratch = (GridScratch){ 0 };
+}
+
+// CPU copy of the grid image plus the texture it is uploaded to, like the
+// stained-glass panel: tiles are written straight into `pixels` and only the
+// rows touched by a redraw are re-uploaded. Allocated once at monitor size.
+typedef struct {
+    Texture2D tex;
+    Color *pixels;
+    int width, height;
+} GridCanvas;
+
+static GridCanvas g_grid_canvas;
+
+static void grid_canvas_init(int width, int height) {
+    // The background is BLANK (all-zero bytes), so calloc's zeroed pages are
+    // already the cleared canvas; the texture is created straight from that buffer
+    // instead of filling a separate GenImageColor image pixel by pixel.
+    g_grid_canvas.pixels = (Color *)calloc((size_t)width * height, sizeof(Color));
+    Image img = {
+        .data = g_grid_canvas.pixels,
+        .width = width,
+        .height = height,
+        .mipmaps = 1,
+        .format = PIXELFORMAT_UNCOMPRESSED_R8G8B8A8,
+    };
+    g_grid_canvas.tex = LoadTextureFromImage(img);
+    SetTextureFilter(g_grid_canvas.tex, TEXTURE_FILTER_POINT);
+    g_grid_canvas.width = width;
+    g_grid_canvas.height = height;
+}
+
+static void grid_canvas_free(void) {
+    UnloadTexture(g_grid_canvas.tex);
+    free(g_grid_canvas.pixels);
+    g_grid_canvas = (GridCanvas){ 0 };
+}
+
+// Fill one tile's square (clipped to the canvas) with a solid colour. The first
+// row is written as plain 32-bit stores, which the compiler vectorises; the rest
+// of the square is copies of that row.
+static void fill_tile(GridCanvas *c, int x, int y, int size, Color col) {
+    int w = (x + size > c->width)  ? c->width - x  : size;
+    int h = (y + size > c->height) ? c->height - y : size;
+    if (w <= 0 || h <= 0) return;
+
+    Color *first = c->pixels + (size_t)y * c->width + x;
+    for (int k = 0; k < w; k++) first[k] = col;
+    Color *p = first;
+    for (int r = 1; r < h; r++) {
+        p += c->width;
+        memcpy(p, first, (size_t)w * sizeof(Color));
+    }
+}
+
+// Paint `num_units` tile colours onto the grid canvas. With `full` the canvas
+// is cleared and every tile drawn; otherwise it still holds the previous frame
+// and only tiles whose colour changed are repainted, plus the tail cleared if
+// the array shrank. Consecutive generations leave most tiles the same colour,
+// so an array change usually touches a small fraction of the grid.
+static void paint_grid(const Color *colors, int num_units, int grid_width, bool full) {
+    GridCanvas *c = &g_grid_canvas;
+
+    // Rows of the canvas touched by this redraw, uploaded in one go at the end
+    int y_lo = c->height, y_hi = 0;
+    if (full) {
+        // BLANK is all-zero bytes, so the clear is one memset
+        memset(c->pixels, 0, (size_t)c->width * c->height * sizeof(Color));
+        g_grid_scratch.drawn_count = 0;
+        y_lo = 0; y_hi = c->height;
+    }
+
+    grid_scratch_reserve(num_units);
+    Color *drawn = g_grid_scratch.drawn;
+
+    // Tiles leave a 1px gap (left transparent) on their right and bottom edges
+    int ts = g_tile_size, fill = g_tile_size - 1;
+    int prev = g_grid_scratch.drawn_count;
+    int last = (prev > num_units) ? prev : num_units;
+    // Tile origin tracked incrementally rather than a divide/modulo per unit
+    int x = 0, y = 0, col_idx = 0;
+    for (int i = 0; i < last; i++) {
+        Color col = (i < num_units) ? colors[i] : BLANK;   // past the end: erase
+        if ((i >= prev || memcmp(&col, &drawn[i], sizeof(Color)) != 0) &&
+            x < c->width && y < c->height) {
+            drawn[i] = col;
+            fill_tile(c, x, y, fill, col);
+            if (y < y_lo) y_lo = y;
+            if (y + fill > y_hi) y_hi = y + fill;
+        }
+        if (++col_idx == grid_width) { col_idx = 0; x = 0; y += ts; }
+        else x += ts;
+    }
+    g_grid_scratch.drawn_count = num_units;
+
+    if (y_hi > c->height) y_hi = c->height;
+    if (y_lo < y_hi) {
+        UpdateTextureRec(c->tex, (Rectangle){ 0, (float)y_lo, (float)c->width, (float)(y_hi - y_lo) },
+                         c->pixels + (size_t)y_lo * c->width);
+    }
+}
+
+// Colour the visible part of the array and paint it onto the grid canvas.
+static void draw_grid(Simulation *sim, Colorizer *colorizer, const unsigned int *hashes,
+                      int grid_width, int max_units, bool full) {
     int num_units = sim->array.num_units;
-    if (num_units == 0) return;
 
     // Only draw tiles that fall inside the viewport. The grid is CPU/immediate-mode
     // (one hash + DrawRectangle per unit, every frame, even paused), so rendering the
@@ -536,31 +808,276 @@ static void draw_grid(Simulation *sim, Colorizer *colorizer, int offset_x, int o
     // entire slowdown. Cap to the visible row count.
     if (max_units > 0 && num_units > max_units) num_units = max_units;
 
-    for (int i = 0; i < num_units; i++) {
-        int row = i / grid_width;
-        int col = i % grid_width;
+    // Colour the visible range from the unit hashes (which come in precomputed):
+    // positions whose hash matches the one their colour was made for keep it,
+    // and each run of the rest goes to the colorizer as one batched call.
+    grid_scratch_reserve(num_units);
+    Color *colors = g_grid_scratch.colors;
+    unsigned int *color_hashes = g_grid_scratch.color_hashes;
+    int valid = g_grid_scratch.colored;
+    int i = 0;
+    while (i < num_units) {
+        if (i < valid && color_hashes[i] == hashes[i]) { i++; continue; }
+        int run = i + 1;
+        while (run < num_units && !(run < valid && color_hashes[run] == hashes[run])) run++;
+        colorizer_get_colors(colorizer, sim->array.units + i, hashes + i, run - i, colors + i);
+        memcpy(color_hashes + i, hashes + i, (size_t)(run - i) * sizeof(unsigned int));
+        i = run;
+    }
+    if (num_units > valid) g_grid_scratch.colored = num_units;
 
-        Color c = colorizer_get_color(colorizer, sim->array.units[i]);
+    paint_grid(colors, num_units, grid_width, full);
+}
 
-        int x = offset_x + col * g_tile_size;
-        int y = offset_y + row * g_tile_size;
+// ============================================================================
+// Replay
+// ============================================================================
 
-        DrawRectangle(x, y, g_tile_size - 1, g_tile_size - 1, c);
+// Ring buffer of the last REPLAY_FRAMES grid redraws of a run (the visible tile
+// colours, already computed for the live view). Replaying a run then just
+// repaints stored frames -- no re-simulation, hashing or colour projection.
+#define REPLAY_FRAMES 300
+
+typedef struct {
+    Color *colors[REPLAY_FRAMES];
+    int capacity[REPLAY_FRAMES];
+    int num_units[REPLAY_FRAMES];
+    int generation[REPLAY_FRAMES];
+    int head, count;           // oldest frame, frames held
+    bool playing;
+    int pos;                   // frames played so far
+    double last_frame;         // GetTime() of the last frame shown
+} ReplayBuffer;
+
+static ReplayBuffer g_replay;
+
+static void replay_record(const Color *colors, int num_units, int generation) {
+    ReplayBuffer *r = &g_replay;
+    int slot = (r->head + r->count) % REPLAY_FRAMES;
+    if (r->count == REPLAY_FRAMES) {
+        r->head = (r->head + 1) % REPLAY_FRAMES;
+    } else {
+        r->count++;
+    }
+    if (num_units > r->capacity[slot]) {
+        r->colors[slot] = (Color *)realloc(r->colors[slot], (size_t)num_units * sizeof(Color));
+        r->capacity[slot] = num_units;
+    }
+    memcpy(r->colors[slot], colors, (size_t)num_units * sizeof(Color));
+    r->num_units[slot] = num_units;
+    r->generation[slot] = generation;
+}
+
+static void replay_clear(void) {
+    g_replay.head = g_replay.count = 0;
+    g_replay.playing = false;
+}
+
+// Paint the next stored frame if one is due. Returns false once playback has
+// run past the newest frame (the caller then redraws the live grid).
+static bool replay_step(int grid_width, double now) {
+    ReplayBuffer *r = &g_replay;
+    if (now - r->last_frame < 1.0 / GRID_REDRAW_HZ) return true;
+    if (r->pos >= r->count) {
+        r->playing = false;
+        return false;
     }
+    int slot = (r->head + r->pos) % REPLAY_FRAMES;
+    paint_grid(r->colors[slot], r->num_units[slot], grid_width, false);
+    r->pos++;
+    r->last_frame = now;
+    return true;
+}
+
+static int replay_generation(void) {
+    const ReplayBuffer *r = &g_replay;
+    if (r->pos == 0) return 0;
+    return r->generation[(r->head + r->pos - 1) % REPLAY_FRAMES];
+}
+
+static void replay_free(void) {
+    for (int i = 0; i < REPLAY_FRAMES; i++) free(g_replay.colors[i]);
+    g_replay = (ReplayBuffer){ 0 };
+}
+
+// ============================================================================
+// Frame export
+// ============================================================================
+
+// Writes the replay frames as numbered PNGs for offline video. PNG deflate is
+// the slow part, so the frames are snapshotted on the main thread and a pool of
+// worker threads renders + encodes them; the UI only polls for completion.
+#define EXPORT_MAX_THREADS 8
+
+typedef struct {
+    pthread_t threads[EXPORT_MAX_THREADS];
+    int nthreads;
+    pthread_mutex_t lock;
+    bool active;
+    // Snapshot of the frames being written (owned; freed when the export ends)
+    Color *frames[REPLAY_FRAMES];
+    int num_units[REPLAY_FRAMES];
+    int count;
+    int grid_width, tile;
+    char dir[1024];
+    // Progress, guarded by lock
+    int next, done;
+} FrameExport;
+
+static FrameExport g_export;
+
+// Render one frame's tiles (with the same 1px gaps as the live grid) and save it
+static void export_write_frame(FrameExport *e, int f) {
+    int n = e->num_units[f];
+    int rows = (n + e->grid_width - 1) / e->grid_width;
+    if (rows < 1) rows = 1;
+    int w = e->grid_width * e->tile, h = rows * e->tile;
+    Color *px = (Color *)calloc((size_t)w * h, sizeof(Color));
+
+    for (int i = 0; i < n; i++) {
+        int x = (i % e->grid_width) * e->tile, y = (i / e->grid_width) * e->tile;
+        for (int r = 0; r < e->tile - 1; r++) {
+            Color *p = px + (size_t)(y + r) * w + x;
+            for (int k = 0; k < e->tile - 1; k++) p[k] = e->frames[f][i];
+        }
+    }
+
+    Image img = { .data = px, .width = w, .height = h, .mipmaps = 1,
+                  .format = PIXELFORMAT_UNCOMPRESSED_R8G8B8A8 };
+    char path[1100];
+    snprintf(path, sizeof(path), "%s/frame_%04d.png", e->dir, f);
+    ExportImage(img, path);
+    free(px);
+}
+
+static void *export_worker(void *arg) {
+    FrameExport *e = (FrameExport *)arg;
+    for (;;) {
+        pthread_mutex_lock(&e->lock);
+        int f = (e->next < e->count) ? e->next++ : -1;
+        pthread_mutex_unlock(&e->lock);
+        if (f < 0) return NULL;
+
+        export_write_frame(e, f);
+
+        pthread_mutex_lock(&e->lock);
+        e->done++;
+        pthread_mutex_unlock(&e->lock);
+    }
+}
+
+// Snapshot the replay frames and start the workers, writing into a
+// censim_frames_gen<N> directory under `parent`. Returns false if an export is
+// already running, there is nothing to write or the directory can't be made.
+static bool export_start(const char *parent, int grid_width, int generation) {
+    FrameExport *e = &g_export;
+    const ReplayBuffer *r = &g_replay;
+    if (e->active || r->count == 0) return false;
+
+    char dir[sizeof(e->dir)];
+    snprintf(dir, sizeof(dir), "%s/censim_frames_gen%d", parent, generation);
+    if (mkdir(dir, 0755) != 0 && access(dir, W_OK) != 0) {
+        fprintf(stderr, "Save frames: could not write to '%s'\n", dir);
+        return false;
+    }
+    memcpy(e->dir, dir, sizeof(dir));
+
+    for (int f = 0; f < r->count; f++) {
+        int slot = (r->head + f) % REPLAY_FRAMES;
+        int n = r->num_units[slot];
+        e->frames[f] = (Color *)malloc((size_t)(n > 0 ? n : 1) * sizeof(Color));
+        memcpy(e->frames[f], r->colors[slot], (size_t)n * sizeof(Color));
+        e->num_units[f] = n;
+    }
+    e->count = r->count;
+    e->grid_width = grid_width;
+    e->tile = g_tile_size;
+    e->next = e->done = 0;
+
+    long ncpu = sysconf(_SC_NPROCESSORS_ONLN);
+    e->nthreads = (ncpu > 0) ? (int)ncpu : 1;
+    if (e->nthreads > EXPORT_MAX_THREADS) e->nthreads = EXPORT_MAX_THREADS;
+    if (e->nthreads > e->count) e->nthreads = e->count;
+
+    pthread_mutex_init(&e->lock, NULL);
+    e->active = true;
+    // Workers pull frames from a shared queue, so any one that starts finishes
+    // the export; only the ones that did start are joined. If none can be
+    // started the frames are written here instead.
+    int started = 0;
+    for (int t = 0; t < e->nthreads; t++) {
+        if (pthread_create(&e->threads[started], NULL, export_worker, e) == 0) started++;
+    }
+    e->nthreads = started;
+    if (started == 0) export_worker(e);
+    return true;
+}
+
+// Join the workers (blocking until they finish) and free the snapshot
+static void export_end(FrameExport *e) {
+    for (int t = 0; t < e->nthreads; t++) pthread_join(e->threads[t], NULL);
+    for (int f = 0; f < e->count; f++) free(e->frames[f]);
+    pthread_mutex_destroy(&e->lock);
+    e->active = false;
+    printf("Exported %d frames to %s/\n", e->count, e->dir);
+}
+
+// Frames written so far; ends the export once the last one is done. Call each
+// frame while an export is active.
+static int export_poll(void) {
+    FrameExport *e = &g_export;
+    pthread_mutex_lock(&e->lock);
+    int done = e->done;
+    pthread_mutex_unlock(&e->lock);
+
+    if (done == e->count) export_end(e);
+    return done;
+}
+
+// Wait for a running export to finish (used at shutdown)
+static void export_finish(void) {
+    if (g_export.active) export_end(&g_export);
 }
 
 // ============================================================================
 // Stats panel
 // ============================================================================
 
+// Formatted stats lines, keyed by the values they show. Paused or throttled
+// frames redraw the panel from these instead of re-running the snprintfs.
+typedef struct {
+    bool valid;
+    int generation, num_units, unique, snps, dups, dels;
+    char gen[64], size[64], uniq[64], div[64], muts[96];
+} StatsText;
+
+static StatsText g_stats_text;
+
 static void draw_stats(Simulation *sim, int unique, int x, int y, bool running) {
     // `unique` is passed in (cached, recomputed only when the array changes) so we
     // don't run the O(n) sim_count_unique on every frame.
-    float diversity = (sim->array.num_units > 0)
-        ? (float)unique / (float)sim->array.num_units
-        : 0.0f;
-
-    char buf[256];
+    StatsText *t = &g_stats_text;
+    if (!t->valid || t->generation != sim->stats.generation ||
+        t->num_units != sim->array.num_units || t->unique != unique ||
+        t->snps != sim->stats.snp_count || t->dups != sim->stats.dup_count ||
+        t->dels != sim->stats.del_count) {
+        float diversity = (sim->array.num_units > 0)
+            ? (float)unique / (float)sim->array.num_units
+            : 0.0f;
+        snprintf(t->gen,  sizeof(t->gen),  "Generation: %d", sim->stats.generation);
+        snprintf(t->size, sizeof(t->size), "Array size: %d", sim->array.num_units);
+        snprintf(t->uniq, sizeof(t->uniq), "Unique seqs: %d", unique);
+        snprintf(t->div,  sizeof(t->div),  "Diversity: %.4f", diversity);
+        snprintf(t->muts, sizeof(t->muts), "SNPs: %d  Dups: %d  Dels: %d",
+                 sim->stats.snp_count, sim->stats.dup_count, sim->stats.del_count);
+        t->generation = sim->stats.generation;
+        t->num_units  = sim->array.num_units;
+        t->unique     = unique;
+        t->snps = sim->stats.snp_count;
+        t->dups = sim->stats.dup_count;
+        t->dels = sim->stats.del_count;
+        t->valid = true;
+    }
 
     DrawRectangle(x, y, g_panel_width - 20, 215, g_theme.header);
     DrawRectangleLines(x, y, g_panel_width - 20, 215, LIGHTGRAY);
@@ -571,28 +1088,22 @@ static void draw_stats(Simulation *sim, int unique, int x, int y, bool running)
     DrawTextS("Statistics", x + 10, line, 20, WHITE);
     line += spacing + 10;
 
-    snprintf(buf, sizeof(buf), "Generation: %d", sim->stats.generation);
-    DrawTextS(buf, x + 10, line, 18, RAYWHITE);
+    DrawTextS(t->gen, x + 10, line, 18, RAYWHITE);
     line += spacing;
 
-    snprintf(buf, sizeof(buf), "Array size: %d", sim->array.num_units);
-    DrawTextS(buf, x + 10, line, 18, RAYWHITE);
+    DrawTextS(t->size, x + 10, line, 18, RAYWHITE);
     line += spacing;
 
-    snprintf(buf, sizeof(buf), "Unique seqs: %d", unique);
-    DrawTextS(buf, x + 10, line, 18, RAYWHITE);
+    DrawTextS(t->uniq, x + 10, line, 18, RAYWHITE);
     line += spacing;
 
-    snprintf(buf, sizeof(buf), "Diversity: %.4f", diversity);
-    DrawTextS(buf, x + 10, line, 18, RAYWHITE);
+    DrawTextS(t->div, x + 10, line, 18, RAYWHITE);
     line += spacing + 10;
 
     DrawTextS("Mutations", x + 10, line, 16, GRAY);
     line += spacing - 4;
 
-    snprintf(buf, sizeof(buf), "SNPs: %d  Dups: %d  Dels: %d",
-             sim->stats.snp_count, sim->stats.dup_count, sim->stats.del_count);
-    DrawTextS(buf, x + 10, line, 16, RAYWHITE);
+    DrawTextS(t->muts, x + 10, line, 16, RAYWHITE);
     line += spacing;
 
     // Status indicator
@@ -644,6 +1155,10 @@ int main(void) {
     // Snapshot the starting parameters so Reset can restore every slider to its
     // original value (sim_reset only rewinds the array/stats, not the params).
     SimParams initial_params = sim.params;
+    // The sliders edit this copy; it is pushed to sim.params once the mouse
+    // button is released, so dragging a slider doesn't feed the simulation a new
+    // parameter set (and re-derive its per-rate constants) on every frame.
+    SimParams ui_params = sim.params;
 
     // Initialize colorizer
     Colorizer colorizer;
@@ -651,19 +1166,37 @@ int main(void) {
 
     // Cached grid render. The coloured-square grid is expensive to build (a 712-d
     // colour projection per tile on cache misses) and was rebuilt every frame --
-    // even while paused. Instead render it into a GPU texture once and re-render
-    // only when the array actually changes (grid_dirty). Idle/paused frames then
-    // cost a single textured-quad blit. cached_unique does the same for the O(n)
-    // unique-sequence count that draw_stats showed every frame.
-    RenderTexture2D grid_rt = LoadRenderTexture(monitor_w, monitor_h);
-    SetTextureFilter(grid_rt.texture, TEXTURE_FILTER_POINT);
+    // even while paused. Instead keep it in a texture and re-render only when the
+    // array actually changes (grid_dirty). Idle/paused frames then cost a single
+    // textured-quad blit. cached_unique does the same for the O(n) unique-sequence
+    // count that draw_stats showed every frame.
+    grid_canvas_init(monitor_w, monitor_h);
+    // Size the per-unit hash/colour buffers for the largest array the bounds
+    // allow up front, so the running simulation never reallocs (and copies) them
+    // as the array grows. Unbounded runs past that still grow on demand.
+    grid_scratch_reserve(sim.params.max_array_size > DEFAULT_INITIAL_SIZE
+                         ? sim.params.max_array_size : DEFAULT_INITIAL_SIZE);
     bool grid_dirty = true;
+    // The unit hashes (and the unique count derived from them) only go stale when
+    // the array itself changes, not on every grid redraw: a resize or re-layout
+    // redraws from the hashes already held in g_grid_scratch. Only sim_step
+    // changes the array and each step advances the generation, so the generation
+    // they were computed at is the cache key (-1: never computed). A Step on a
+    // collapsed array, or a Reset of an unrun one, then recomputes nothing.
+    int hashed_gen = -1;
+    // A new grid width or tile size moves every tile, so the texture has to be
+    // redrawn from scratch; other redraws only repaint the tiles that changed.
+    bool grid_full = true;
+    double last_grid_redraw = 0.0;
+    double grid_redraw_cost = 0.0;   // seconds the last grid rebuild took
+    double sim_gens_per_sec = 0.0;   // smoothed sim_run throughput; 0 = not yet measured
 
     // Live self-identity ("stained glass") panel, bottom-left above the stats.
     StainedGlass stained_glass;
     sg_init(&stained_glass);
     int  cached_unique = 0;
-    int  last_w_px = monitor_w, last_h_px = monitor_h;
+    bool history_pending = false;  // sim advanced; record once cached_unique is fresh
+    int  grid_rows = 0;            // visible grid rows the canvas was last laid out for
 
     // UI state
     bool running = false;
@@ -677,8 +1210,11 @@ int main(void) {
     bool show_advanced = false;
     char step_size_text[16] = "10000";
     bool step_size_edit = false;
+    // Step button label, rebuilt only when step_size changes rather than
+    // re-formatted every frame
+    char step_label[32];
+    snprintf(step_label, sizeof(step_label), "#79#Step %d", step_size);
     double umap_start_time = 0.0;  // When UMAP was started (0 = not running)
-    int refresh_counter = 0;
     float panel_scroll = 0.0f;  // Scroll offset for controls panel
 
     // Mission control state
@@ -747,41 +1283,96 @@ int main(void) {
             last_screen_width = screen_width;
             last_panel_width  = g_panel_width;
             last_tile_size    = g_tile_size;
-            grid_dirty = true;
+            grid_dirty = grid_full = true;
         }
-        // Any size change alters the visible grid region -> rebuild the cache once.
-        if (screen_width != last_w_px || screen_height != last_h_px) {
-            grid_dirty = true; last_w_px = screen_width; last_h_px = screen_height;
+        // The visible region only depends on the grid width (above) and the number
+        // of tile rows that fit the window height, so a resize that keeps the row
+        // count -- every intermediate step of a drag, mostly -- leaves the grid as is.
+        int visible_rows = (screen_height - 10) / g_tile_size + 2;
+        if (visible_rows != grid_rows) {
+            grid_dirty = true; grid_rows = visible_rows;
         }
 
         // Update simulation (single-view only)
         if (app_mode == 0 && running && !sim.stats.collapsed) {
-            sim_run(&sim, (int)gens_per_frame);
-            grid_dirty = true;  // array changed -> grid + unique count are stale
+            // Run the slider's generation count, capped to what the measured
+            // throughput fits into SIM_FRAME_BUDGET. Until there is a measurement
+            // the frame probes with a single generation.
+            int gens = (int)gens_per_frame;
+            int fit = (int)(SIM_FRAME_BUDGET * sim_gens_per_sec);
+            if (fit < 1) fit = 1;
+            if (gens > fit) gens = fit;
+            double t0 = GetTime();
+            sim_run(&sim, gens);
+            double dt = GetTime() - t0;
+            if (dt > 0.0) {
+                double rate = gens / dt;
+                sim_gens_per_sec = (sim_gens_per_sec > 0.0)
+                    ? 0.8 * sim_gens_per_sec + 0.2 * rate : rate;
+            }
+            grid_dirty = true;  // array changed -> grid is stale
 
-            // Record stats for mission control
-            history_record(&stats_history, &sim);
+            // Record stats for mission control after the grid rebuild below,
+            // which recounts unique units for this frame anyway
+            history_pending = true;
 
-            // Refresh colorizer cache periodically
-            refresh_counter++;
-            if (refresh_counter >= 60) {  // Every second at 60 FPS
-                refresh_counter = 0;
-                // Don't clear cache - let it grow for performance
-            }
         }
 
         // Re-render the grid into its cached GPU texture only when the array
         // changed. Skipped on idle/paused frames, so the per-tile colour projection
         // and the O(n) unique count stop running every frame -- the blit below is
-        // all that remains on an idle frame.
-        if (app_mode == 0 && grid_dirty) {
-            cached_unique = sim_count_unique(&sim);
-            int gmax = grid_width * ((screen_height - 10) / g_tile_size + 2);
-            BeginTextureMode(grid_rt);
-                ClearBackground(BLANK);
-                draw_grid(&sim, &colorizer, 0, 0, grid_width, gmax);
-            EndTextureMode();
-            grid_dirty = false;
+        // all that remains on an idle frame. While running, rebuilds are capped at
+        // GRID_REDRAW_HZ; layout changes still redraw straight away.
+        // Frameskip: if a rebuild costs more than half the redraw interval (a very
+        // large array), stretch the interval to twice that cost so rebuilds can
+        // never crowd out the simulation -- grid frames are dropped, not queued.
+        double now = GetTime();
+        double redraw_interval = 1.0 / GRID_REDRAW_HZ;
+        if (2.0 * grid_redraw_cost > redraw_interval) redraw_interval = 2.0 * grid_redraw_cost;
+        bool redraw_due = !running || grid_full || now - last_grid_redraw >= redraw_interval;
+
+        // Replay owns the grid canvas while it plays; a re-layout ends it, and so
+        // does running off the newest frame -- either way the live grid is redrawn.
+        if (g_replay.playing) {
+            if (app_mode != 0 || grid_full) g_replay.playing = false;
+            else if (!replay_step(grid_width, now)) grid_dirty = true;
+        }
+
+        if (app_mode == 0 && grid_dirty && redraw_due && !g_replay.playing) {
+            // Hash every unit once per array change; the unique count and the
+            // colour cache share it
+            unsigned int *unit_hashes = g_grid_scratch.hashes;
+            bool new_gen = (hashed_gen != sim.stats.generation);
+            if (new_gen) {
+                grid_scratch_reserve(sim.array.num_units);
+                unit_hashes = g_grid_scratch.hashes;
+                sim_hash_units(&sim, unit_hashes);
+                cached_unique = sim_count_unique_hashes(unit_hashes, sim.array.num_units);
+                hashed_gen = sim.stats.generation;
+            }
+            int gmax = grid_width * grid_rows;
+            draw_grid(&sim, &colorizer, unit_hashes, grid_width, gmax, grid_full);
+            // Keep each newly simulated state's tile colours for replay
+            if (new_gen) {
+                replay_record(g_grid_scratch.colors,
+                              sim.array.num_units < gmax ? sim.array.num_units : gmax,
+                              sim.stats.generation);
+            }
+            grid_dirty = grid_full = false;
+            last_grid_redraw = now;
+            grid_redraw_cost = GetTime() - now;
+        }
+        // Sample only once cached_unique has caught up with the array (a throttled
+        // frame leaves it stale); the pending sample then lands on the next redraw.
+        if (history_pending && hashed_gen == sim.stats.generation) {
+            history_record(&stats_history, &sim, cached_unique);
+            history_pending = false;
+        }
+
+        // Re-render the statistics plots if a sample landed or the layout changed
+        int mc_height = mc_minimized ? 24 : mc_panel_height;
+        if (app_mode == 0) {
+            mission_control_cache_update(&stats_history, screen_width, mc_height, mc_minimized, g_panel_width);
         }
 
         // Drawing
@@ -802,11 +1393,8 @@ int main(void) {
             continue;
         }
 
-        // Blit the cached grid texture (rebuilt above only when dirty). The render
-        // texture is stored bottom-up, so a negative source height flips it upright.
-        DrawTextureRec(grid_rt.texture,
-                       (Rectangle){ 0, 0, (float)grid_rt.texture.width, -(float)grid_rt.texture.height },
-                       (Vector2){ 10, 10 }, WHITE);
+        // Blit the cached grid texture (rebuilt above only when dirty)
+        DrawTexture(g_grid_canvas.tex, 10, 10, WHITE);
 
         // Measured dup/del statistics vs theory (overlay, top-left of the grid)
         draw_measure_cluster(&stats_history, &sim, 12, 28);
@@ -855,11 +1443,11 @@ int main(void) {
         Vector2 mouse = GetMousePosition();
 
         // Calculate content height (approximate based on controls)
-        int content_height = 830;  // Base height (incl. dup/del ratio row + 2-line readout)
+        int content_height = 880;  // Base height (incl. dup/del ratio row + 2-line readout + replay)
         if (show_advanced) {
             content_height += 150;  // advanced block (freq derived from Dup/del ratio; no bias row/warning)
-            if (sim.params.count_dist == DIST_NEGATIVE_BINOMIAL) content_height += 26;
-            if (sim.params.size_dist == SIZE_POWER_LAW) content_height += 26;
+            if (ui_params.count_dist == DIST_NEGATIVE_BINOMIAL) content_height += 26;
+            if (ui_params.size_dist == SIZE_POWER_LAW) content_height += 26;
         }
 
         // Max scroll is negative (scrolling down moves content up)
@@ -899,36 +1487,40 @@ int main(void) {
         if (GuiButton((Rectangle){panel_x + 20, btn_y, 180, btn_h},
                       running ? "#132#Stop" : "#131#Start")) {
             running = !running;
+            if (g_replay.playing) {
+                g_replay.playing = false;
+                grid_dirty = true;
+            }
         }
         if (GuiButton((Rectangle){panel_x + 210, btn_y, 180, btn_h}, "#72#Reset")) {
             running = false;
             sim_reset(&sim);
             sim.params = initial_params;   // restore all sliders to their originals
+            ui_params = initial_params;
             gens_per_frame = 100.0f;
             step_size = 10000;
             snprintf(step_size_text, sizeof(step_size_text), "%d", step_size);
-            colorizer_clear_cache(&colorizer);
+            snprintf(step_label, sizeof(step_label), "#79#Step %d", step_size);
+            // The colour cache is keyed by sequence hash and colours are a pure
+            // function of the sequence, so entries stay valid across a reset --
+            // keeping them means the fresh array's monomer is already coloured.
             history_clear(&stats_history);
+            replay_clear();
             grid_dirty = true;
         }
         btn_y += btn_spacing;
 
-        if (GuiButton((Rectangle){panel_x + 20, btn_y, 180, btn_h}, TextFormat("#79#Step %d", step_size))) {
+        if (GuiButton((Rectangle){panel_x + 20, btn_y, 180, btn_h}, step_label)) {
             sim_run(&sim, step_size);
             grid_dirty = true;
         }
         if (GuiButton((Rectangle){panel_x + 210, btn_y, 180, btn_h}, "#07#Export FASTA")) {
             char filepath[1024] = {0};
             if (get_save_fasta_path(filepath, sizeof(filepath), sim.stats.generation)) {
-                FILE *f = fopen(filepath, "w");
-                if (f) {
-                    for (int i = 0; i < sim.array.num_units; i++) {
-                        fprintf(f, ">repeat_%d\n%s\n", i + 1, sim.array.units[i]);
-                    }
-                    fclose(f);
+                if (write_fasta(filepath, &sim)) {
                     printf("Exported %d repeats to %s\n", sim.array.num_units, filepath);
                 } else {
-                    fprintf(stderr, "Export FASTA: could not open '%s' for writing\n", filepath);
+                    fprintf(stderr, "Export FASTA: could not write '%s'\n", filepath);
                 }
             }
         }
@@ -952,8 +1544,8 @@ int main(void) {
         DrawTextS("INDEL rate:", panel_x + 20, btn_y + 2, 16, LIGHTGRAY);
         GuiSlider(
             (Rectangle){panel_x + label_w + 20, btn_y, slider_w, slider_h},
-            NULL, TextFormat("%.2f", sim.params.indel_rate),
-            &sim.params.indel_rate, 0.0f, 3.0f);
+            NULL, TextFormat("%.2f", ui_params.indel_rate),
+            &ui_params.indel_rate, 0.0f, 3.0f);
         if (CheckCollisionPointRec(mouse, indel_row)) {
             hover_text = "Expected INDELs (dup/del) per generation";
             hover_rect = indel_row;
@@ -966,8 +1558,8 @@ int main(void) {
         DrawTextS("Mean size:", panel_x + 20, btn_y + 2, 16, LIGHTGRAY);
         GuiSlider(
             (Rectangle){panel_x + label_w + 20, btn_y, slider_w, slider_h},
-            NULL, TextFormat("%.1f", sim.params.indel_size_lambda),
-            &sim.params.indel_size_lambda, 1.0f, 100.0f);
+            NULL, TextFormat("%.1f", ui_params.indel_size_lambda),
+            &ui_params.indel_size_lambda, 1.0f, 100.0f);
         if (CheckCollisionPointRec(mouse, size_row)) {
             hover_text = "Mean indel event size in repeat units (split into dup/del by Dup/del ratio)";
             hover_rect = size_row;
@@ -983,15 +1575,15 @@ int main(void) {
         // Wrap "ratio" onto a second line so the label doesn't crowd the slider.
         DrawTextS("Dup/del", panel_x + 20, btn_y - 5, 16, LIGHTGRAY);
         DrawTextS("ratio:",  panel_x + 20, btn_y - 5 + scaled_font(16), 16, LIGHTGRAY);
-        float size_ratio_e = log10f(sim.params.dup_del_size_ratio);
-        const char *rfmt = sim.params.dup_del_size_ratio < 1.0f ? "%.3fx"
-                         : sim.params.dup_del_size_ratio < 10.0f ? "%.2fx" : "%.0fx";
+        float size_ratio_e = log10f(ui_params.dup_del_size_ratio);
+        const char *rfmt = ui_params.dup_del_size_ratio < 1.0f ? "%.3fx"
+                         : ui_params.dup_del_size_ratio < 10.0f ? "%.2fx" : "%.0fx";
         GuiSlider(
             (Rectangle){panel_x + label_w + 20, btn_y, slider_w, slider_h},
-            NULL, TextFormat(rfmt, sim.params.dup_del_size_ratio),
+            NULL, TextFormat(rfmt, ui_params.dup_del_size_ratio),
             &size_ratio_e, -3.0f, 3.0f);
-        sim.params.dup_del_size_ratio = powf(10.0f, size_ratio_e);
-        sim.params.dup_bias = 1.0f / (1.0f + sim.params.dup_del_size_ratio);  // coupled freq
+        ui_params.dup_del_size_ratio = powf(10.0f, size_ratio_e);
+        ui_params.dup_bias = 1.0f / (1.0f + ui_params.dup_del_size_ratio);  // coupled freq
         if (CheckCollisionPointRec(mouse, ratio_row)) {
             hover_text = "Dup:del size ratio; frequency auto-balanced to hold array size (bigger = rarer)";
             hover_rect = ratio_row;
@@ -1000,14 +1592,14 @@ int main(void) {
 
         // Four derived stats from (Mean size, INDEL rate, Dup/del ratio).
         {
-            float r = sim.params.dup_del_size_ratio, sr = sqrtf(r);
+            float r = ui_params.dup_del_size_ratio, sr = sqrtf(r);
             float pdup = 1.0f / (1.0f + r);
-            DrawTextS(TextFormat("dup ~%.1f u  %.2f/gen", sim.params.indel_size_lambda * sr,
-                                sim.params.indel_rate * pdup),
+            DrawTextS(TextFormat("dup ~%.1f u  %.2f/gen", ui_params.indel_size_lambda * sr,
+                                ui_params.indel_rate * pdup),
                      panel_x + label_w + 20, btn_y - 2, 12, (Color){130, 160, 130, 255});
             btn_y += 14;
-            DrawTextS(TextFormat("del ~%.1f u  %.2f/gen", sim.params.indel_size_lambda / sr,
-                                sim.params.indel_rate * (1.0f - pdup)),
+            DrawTextS(TextFormat("del ~%.1f u  %.2f/gen", ui_params.indel_size_lambda / sr,
+                                ui_params.indel_rate * (1.0f - pdup)),
                      panel_x + label_w + 20, btn_y - 2, 12, (Color){130, 160, 130, 255});
             btn_y += 18;
         }
@@ -1017,8 +1609,8 @@ int main(void) {
         DrawTextS("SNP rate:", panel_x + 20, btn_y + 2, 16, LIGHTGRAY);
         GuiSlider(
             (Rectangle){panel_x + label_w + 20, btn_y, slider_w, slider_h},
-            NULL, TextFormat("%.2f", sim.params.snp_rate),
-            &sim.params.snp_rate, 0.0f, 1.0f);
+            NULL, TextFormat("%.2f", ui_params.snp_rate),
+            &ui_params.snp_rate, 0.0f, 1.0f);
         if (CheckCollisionPointRec(mouse, snp_row)) {
             hover_text = "Expected point mutations per generation";
             hover_rect = snp_row;
@@ -1041,12 +1633,12 @@ int main(void) {
         // Target size
         Rectangle target_row = {panel_x, btn_y - 5, g_panel_width, row_h};
         DrawTextS("Target size:", panel_x + 20, btn_y + 2, 16, LIGHTGRAY);
-        float target_f = (float)sim.params.target_size;
+        float target_f = (float)ui_params.target_size;
         GuiSlider(
             (Rectangle){panel_x + label_w + 20, btn_y, slider_w, slider_h},
-            NULL, TextFormat("%d", sim.params.target_size),
+            NULL, TextFormat("%d", ui_params.target_size),
             &target_f, 1000.0f, 50000.0f);
-        sim.params.target_size = (int)target_f;
+        ui_params.target_size = (int)target_f;
         if (CheckCollisionPointRec(mouse, target_row)) {
             hover_text = "Target array size for elastic bounding";
             hover_rect = target_row;
@@ -1058,8 +1650,8 @@ int main(void) {
         DrawTextS("Elasticity:", panel_x + 20, btn_y + 2, 16, LIGHTGRAY);
         GuiSlider(
             (Rectangle){panel_x + label_w + 20, btn_y, slider_w, slider_h},
-            NULL, TextFormat("%.2f", sim.params.elasticity),
-            &sim.params.elasticity, 0.0f, 1.0f);
+            NULL, TextFormat("%.2f", ui_params.elasticity),
+            &ui_params.elasticity, 0.0f, 1.0f);
         if (CheckCollisionPointRec(mouse, elast_row)) {
             hover_text = "Pull strength toward target size";
             hover_rect = elast_row;
@@ -1086,13 +1678,7 @@ int main(void) {
             // Write temp FASTA
             char tempfasta[256];
             snprintf(tempfasta, sizeof(tempfasta), "/tmp/censim_temp_%d.fasta", sim.stats.generation);
-            FILE *f = fopen(tempfasta, "w");
-            if (f) {
-                for (int i = 0; i < sim.array.num_units; i++) {
-                    fprintf(f, ">repeat_%d\n%s\n", i + 1, sim.array.units[i]);
-                }
-                fclose(f);
-
+            if (write_fasta(tempfasta, &sim)) {
                 // Build and run visualization command (show mode)
                 char script_cmd[2048];
                 get_umap_command(script_cmd, sizeof(script_cmd), tempfasta, NULL, grid_width);
@@ -1103,6 +1689,43 @@ int main(void) {
         }
         btn_y += btn_spacing;
 
+        // Replay: play back the recorded grid frames of the run so far
+        if (g_replay.playing) {
+            if (GuiButton((Rectangle){panel_x + 20, btn_y, 180, btn_h},
+                          TextFormat("#133#Stop (gen %d)", replay_generation()))) {
+                g_replay.playing = false;
+                grid_dirty = true;
+            }
+        } else {
+            if (g_replay.count == 0) GuiDisable();
+            if (GuiButton((Rectangle){panel_x + 20, btn_y, 180, btn_h},
+                          TextFormat("#130#Replay %d", g_replay.count))) {
+                running = false;
+                g_replay.playing = true;
+                g_replay.pos = 0;
+                g_replay.last_frame = 0.0;
+            }
+            GuiEnable();
+        }
+        // Save the recorded frames as PNGs, encoded on background threads
+        if (g_export.active) {
+            int written = export_poll();
+            GuiDisable();
+            GuiButton((Rectangle){panel_x + 210, btn_y, 180, btn_h},
+                      TextFormat("#2#Saving %d/%d", written, g_export.count));
+            GuiEnable();
+        } else {
+            if (g_replay.count == 0) GuiDisable();
+            if (GuiButton((Rectangle){panel_x + 210, btn_y, 180, btn_h}, "#2#Save frames")) {
+                char parent[1024] = {0};
+                if (get_frames_dir(parent, sizeof(parent))) {
+                    export_start(parent, grid_width, sim.stats.generation);
+                }
+            }
+            GuiEnable();
+        }
+        btn_y += btn_spacing;
+
         // Stats panel
         draw_stats(&sim, cached_unique, panel_x + 10, btn_y, running);
         btn_y += 225;
@@ -1117,8 +1740,8 @@ int main(void) {
         if (show_advanced) {
             // Calculate dynamic height based on visible parameter sliders
             int adv_height = 145;
-            if (sim.params.count_dist == DIST_NEGATIVE_BINOMIAL) adv_height += 26;
-            if (sim.params.size_dist == SIZE_POWER_LAW) adv_height += 26;
+            if (ui_params.count_dist == DIST_NEGATIVE_BINOMIAL) adv_height += 26;
+            if (ui_params.size_dist == SIZE_POWER_LAW) adv_height += 26;
 
             DrawRectangle(panel_x + 10, btn_y, g_panel_width - 20, adv_height, (Color){40, 40, 40, 200});
 
@@ -1130,10 +1753,13 @@ int main(void) {
             if (GuiTextBox((Rectangle){panel_x + 120, adv_y - 3, 100, 24},
                           step_size_text, 16, step_size_edit)) {
                 step_size_edit = !step_size_edit;
-            }
-            if (!step_size_edit) {
-                int val = atoi(step_size_text);
-                if (val > 0) step_size = val;
+                // The text only changes while editing, so parse it once when the
+                // edit ends instead of on every frame
+                if (!step_size_edit) {
+                    int val = atoi(step_size_text);
+                    if (val > 0) step_size = val;
+                    snprintf(step_label, sizeof(step_label), "#79#Step %d", step_size);
+                }
             }
             if (CheckCollisionPointRec(mouse, step_row)) {
                 hover_text = "Generations per 'Step N' button click";
@@ -1145,7 +1771,7 @@ int main(void) {
 
             // Hard bounds checkbox
             Rectangle bounds_row = {panel_x + 20, adv_y, 300, 20};
-            GuiCheckBox((Rectangle){panel_x + 20, adv_y, 20, 20}, "Hard bounds (min/max)", &sim.params.bounding_enabled);
+            GuiCheckBox((Rectangle){panel_x + 20, adv_y, 20, 20}, "Hard bounds (min/max)", &ui_params.bounding_enabled);
             if (CheckCollisionPointRec(mouse, bounds_row)) {
                 hover_text = "Enforce min/max array size limits";
             }
@@ -1162,12 +1788,12 @@ int main(void) {
 
             // Dispersion slider row (only if NB selected)
             int dispersion_y = adv_y;
-            if (sim.params.count_dist == DIST_NEGATIVE_BINOMIAL) {
+            if (ui_params.count_dist == DIST_NEGATIVE_BINOMIAL) {
                 Rectangle disp_row = {panel_x + 40, dispersion_y, 300, 20};
                 DrawTextS("dispersion:", panel_x + 40, dispersion_y + 2, 14, GRAY);
                 GuiSlider((Rectangle){panel_x + 140, dispersion_y, 180, 18}, NULL, NULL,
-                          &sim.params.nb_dispersion, 0.1f, 5.0f);
-                DrawTextS(TextFormat("%.1f", sim.params.nb_dispersion), panel_x + 330, dispersion_y + 2, 12, WHITE);
+                          &ui_params.nb_dispersion, 0.1f, 5.0f);
+                DrawTextS(TextFormat("%.1f", ui_params.nb_dispersion), panel_x + 330, dispersion_y + 2, 12, WHITE);
                 if (CheckCollisionPointRec(mouse, disp_row)) {
                     hover_text = "Overdispersion (k): lower = more variance, higher = more Poisson-like";
                 }
@@ -1184,20 +1810,20 @@ int main(void) {
             adv_y += 28;
 
             // Alpha slider row (only if power law selected)
-            if (sim.params.size_dist == SIZE_POWER_LAW) {
+            if (ui_params.size_dist == SIZE_POWER_LAW) {
                 Rectangle alpha_row = {panel_x + 40, adv_y, 300, 20};
                 DrawTextS("alpha:", panel_x + 40, adv_y + 2, 14, GRAY);
                 GuiSlider((Rectangle){panel_x + 140, adv_y, 180, 18}, NULL, NULL,
-                          &sim.params.power_law_alpha, 1.5f, 4.0f);
-                DrawTextS(TextFormat("%.1f", sim.params.power_law_alpha), panel_x + 330, adv_y + 2, 12, WHITE);
+                          &ui_params.power_law_alpha, 1.5f, 4.0f);
+                DrawTextS(TextFormat("%.1f", ui_params.power_law_alpha), panel_x + 330, adv_y + 2, 12, WHITE);
                 if (CheckCollisionPointRec(mouse, alpha_row)) {
                     hover_text = "Tail heaviness: lower = heavier tail (more large events)";
                 }
             }
 
             // Draw dropdowns last - lock the other when one is open to prevent click-through
-            int count_dist = (int)sim.params.count_dist;
-            int size_dist = (int)sim.params.size_dist;
+            int count_dist = (int)ui_params.count_dist;
+            int size_dist = (int)ui_params.size_dist;
 
             if (count_dist_edit) {
                 // Events is open - draw sizes as disabled, then events on top
@@ -1231,12 +1857,15 @@ int main(void) {
                 }
             }
 
-            sim.params.count_dist = (CountDistribution)count_dist;
-            sim.params.size_dist = (SizeDistribution)size_dist;
+            ui_params.count_dist = (CountDistribution)count_dist;
+            ui_params.size_dist = (SizeDistribution)size_dist;
 
             btn_y += adv_height + 5;
         }
 
+        // Apply slider edits once the drag (or click) is over
+        if (!IsMouseButtonDown(MOUSE_BUTTON_LEFT)) sim.params = ui_params;
+
         // End scissor mode before drawing overlays
         EndScissorMode();
 
@@ -1255,9 +1884,13 @@ int main(void) {
             DrawTextS(hover_text, tip_x, tip_y, 14, WHITE);
         }
 
-        // Statistics panel
-        int mc_height = mc_minimized ? 24 : mc_panel_height;
-        draw_mission_control(&stats_history, screen_width, screen_height, mc_height, mc_minimized, g_panel_width);
+        // Statistics panel (blit of the cached render; the texture is bottom-up)
+        if (g_mc_cache.valid) {
+            RenderTexture2D mc_rt = g_mc_cache.rt;
+            DrawTextureRec(mc_rt.texture,
+                           (Rectangle){ 0, 0, (float)mc_rt.texture.width, -(float)mc_rt.texture.height },
+                           (Vector2){ 0, (float)(screen_height - mc_height) }, WHITE);
+        }
 
         // Minimize/maximize toggle button (far left)
         int mc_btn_x = 10;
@@ -1279,8 +1912,12 @@ int main(void) {
     dashboard_free(&dash);
     sim_free(&sim);
     colorizer_free(&colorizer);
+    grid_scratch_free();
     sg_free(&stained_glass);
-    UnloadRenderTexture(grid_rt);
+    grid_canvas_free();
+    mission_control_cache_free();
+    export_finish();
+    replay_free();
     CloseWindow();
 
     return 0;
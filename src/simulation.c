@@ -22,12 +22,29 @@ static unsigned int rng_next(unsigned int *state) {
     return x;
 }
 
+// Uniform in [0, 1): the top 24 bits (a float's full mantissa) times 2^-24.
+// A multiply instead of a divide per draw.
 static float rng_float(unsigned int *state) {
-    return (float)(rng_next(state) & 0x7FFFFFFF) / (float)0x7FFFFFFF;
+    return (float)(rng_next(state) >> 8) * (1.0f / 16777216.0f);
 }
 
+// Uniform in [0, max) by Lemire's multiply-shift: the high 32 bits of the 64-bit
+// product. Avoids the integer divide of `%`, which dominates these calls.
 static int rng_int(unsigned int *state, int max) {
-    return (int)(rng_next(state) % (unsigned int)max);
+    return (int)(((unsigned long long)rng_next(state) * (unsigned int)max) >> 32);
+}
+
+// Uniform in [0, max) for base-pair offsets, which pass INT_MAX once the array
+// holds ~11.9M units. Bounds that fit 32 bits take the same single multiply-shift
+// draw as rng_int (so the random stream is unchanged); larger ones join two draws
+// into 64 bits and reduce with a modulo, whose bias is negligible at max << 2^64.
+static unsigned long rng_index(unsigned int *state, unsigned long max) {
+    if (max <= 0xFFFFFFFFul) {
+        return (unsigned long)(((unsigned long long)rng_next(state) * max) >> 32);
+    }
+    unsigned long long r = (unsigned long long)rng_next(state) << 32;
+    r |= rng_next(state);
+    return (unsigned long)(r % max);
 }
 
 // Poisson sampling. Knuth's product method needs expf(-lambda), which underflows
@@ -36,18 +53,10 @@ static int rng_int(unsigned int *state, int max) {
 // Normal(lambda, lambda), so switch to that there: it keeps the mean exactly at
 // lambda (essential for the drift-free dup/del coupling) and is O(1) instead of
 // O(lambda).
-static int sample_poisson(unsigned int *state, float lambda) {
-    if (lambda <= 0) return 0;
+#define POISSON_NORMAL_CUTOFF 30.0f
 
-    if (lambda > 30.0f) {
-        // Box-Muller standard normal, then scale to Normal(lambda, lambda).
-        float u1 = rng_float(state), u2 = rng_float(state);
-        float z = sqrtf(-2.0f * logf(u1 + 1e-10f)) * cosf(2.0f * 3.14159265f * u2);
-        int k = (int)(lambda + sqrtf(lambda) * z + 0.5f);  // round to nearest
-        return k < 0 ? 0 : k;
-    }
-
-    float L = expf(-lambda);
+// Knuth's product method given L = expf(-lambda).
+static int poisson_knuth(unsigned int *state, float L) {
     int k = 0;
     float p = 1.0f;
 
@@ -59,6 +68,20 @@ static int sample_poisson(unsigned int *state, float lambda) {
     return k - 1;
 }
 
+static int sample_poisson(unsigned int *state, float lambda) {
+    if (lambda <= 0) return 0;
+
+    if (lambda > POISSON_NORMAL_CUTOFF) {
+        // Box-Muller standard normal, then scale to Normal(lambda, lambda).
+        float u1 = rng_float(state), u2 = rng_float(state);
+        float z = sqrtf(-2.0f * logf(u1 + 1e-10f)) * cosf(2.0f * 3.14159265f * u2);
+        int k = (int)(lambda + sqrtf(lambda) * z + 0.5f);  // round to nearest
+        return k < 0 ? 0 : k;
+    }
+
+    return poisson_knuth(state, expf(-lambda));
+}
+
 // Gamma sampling using Marsaglia and Tsang's method
 // Used internally for negative binomial
 static float sample_gamma(unsigned int *state, float shape, float scale) {
@@ -157,6 +180,20 @@ static int sample_count(unsigned int *state, CountDistribution dist, float mean,
     }
 }
 
+// Per-generation event count at `rate`. The common Poisson case reuses the
+// cached expf(-rate): the rates only change when the user moves a slider, but
+// are sampled twice every generation.
+static int sample_event_count(Simulation *sim, PoissonCache *pc, float rate) {
+    if (sim->params.count_dist != DIST_POISSON || rate <= 0 || rate > POISSON_NORMAL_CUTOFF) {
+        return sample_count(&sim->rng_state, sim->params.count_dist, rate, sim->params.nb_dispersion);
+    }
+    if (pc->lambda != rate) {
+        pc->lambda = rate;
+        pc->exp_neg_lambda = expf(-rate);
+    }
+    return poisson_knuth(&sim->rng_state, pc->exp_neg_lambda);
+}
+
 static int sample_size(unsigned int *state, SizeDistribution dist, float mean, float power_law_alpha) {
     switch (dist) {
         case SIZE_GEOMETRIC:
@@ -176,20 +213,77 @@ static int sample_size(unsigned int *state, SizeDistribution dist, float mean, f
 // Repeat Array operations
 // ============================================================================
 
+// Unit blocks hold REPEAT_SIZE bytes + NUL, then the unit's cached hash (see
+// sim_hash_units) in what was padding, rounded up so every block can hold the
+// free-list link pointer at an aligned address.
+#define UNIT_HASH_OFFSET ((REPEAT_SIZE + 1 + sizeof(unsigned int) - 1) & ~(sizeof(unsigned int) - 1))
+#define UNIT_STRIDE ((UNIT_HASH_OFFSET + sizeof(unsigned int) + sizeof(char *) - 1) & ~(sizeof(char *) - 1))
+
+// The cached hash of a unit block; 0 means "not computed since the last write".
+#define UNIT_HASH(unit) (*(unsigned int *)((unit) + UNIT_HASH_OFFSET))
+#define UNITS_PER_SLAB 4096
+
 static void array_init(RepeatArray *arr, int capacity) {
     arr->capacity = capacity;
     arr->num_units = 0;
     arr->units = (char **)malloc(capacity * sizeof(char *));
+    arr->slabs = NULL;
+    arr->num_slabs = 0;
+    arr->slabs_capacity = 0;
+    arr->free_units = NULL;
+    arr->scratch = NULL;
+    arr->scratch_capacity = 0;
 }
 
 static void array_free(RepeatArray *arr) {
-    for (int i = 0; i < arr->num_units; i++) {
-        free(arr->units[i]);
+    // Units live in the slabs; releasing the slabs releases every unit at once
+    for (int i = 0; i < arr->num_slabs; i++) {
+        free(arr->slabs[i]);
     }
+    free(arr->slabs);
+    free(arr->scratch);
     free(arr->units);
     arr->units = NULL;
     arr->num_units = 0;
     arr->capacity = 0;
+    arr->slabs = NULL;
+    arr->num_slabs = 0;
+    arr->slabs_capacity = 0;
+    arr->free_units = NULL;
+    arr->scratch = NULL;
+    arr->scratch_capacity = 0;
+}
+
+// Add a slab and thread all of its blocks onto the free list.
+static void array_add_slab(RepeatArray *arr) {
+    if (arr->num_slabs == arr->slabs_capacity) {
+        arr->slabs_capacity = arr->slabs_capacity ? arr->slabs_capacity * 2 : 16;
+        arr->slabs = (char **)realloc(arr->slabs, arr->slabs_capacity * sizeof(char *));
+    }
+    char *slab = (char *)malloc((size_t)UNITS_PER_SLAB * UNIT_STRIDE);
+    arr->slabs[arr->num_slabs++] = slab;
+
+    for (int i = UNITS_PER_SLAB - 1; i >= 0; i--) {
+        char *block = slab + (size_t)i * UNIT_STRIDE;
+        *(char **)block = arr->free_units;
+        arr->free_units = block;
+    }
+}
+
+static char *alloc_unit(RepeatArray *arr, const char *src) {
+    if (!arr->free_units) array_add_slab(arr);
+    char *unit = arr->free_units;
+    arr->free_units = *(char **)unit;
+
+    memcpy(unit, src, REPEAT_SIZE);
+    unit[REPEAT_SIZE] = '\0';
+    UNIT_HASH(unit) = 0;
+    return unit;
+}
+
+static void free_unit(RepeatArray *arr, char *unit) {
+    *(char **)unit = arr->free_units;
+    arr->free_units = unit;
 }
 
 static void array_ensure_capacity(RepeatArray *arr, int needed) {
@@ -204,22 +298,22 @@ static void array_ensure_capacity(RepeatArray *arr, int needed) {
     arr->capacity = new_capacity;
 }
 
-static char *alloc_unit(const char *src) {
-    char *unit = (char *)malloc(REPEAT_SIZE + 1);
-    memcpy(unit, src, REPEAT_SIZE);
-    unit[REPEAT_SIZE] = '\0';
-    return unit;
-}
-
-// Replace units[start:end) with `n_new` fresh units carved from `seq` (n_new *
-// REPEAT_SIZE bytes). Frees the old units, shifts the tail, inserts the new ones.
-// `seq` may be NULL when n_new == 0 (pure deletion).
+// Replace units[start:end) with `n_new` units carved from `seq` (n_new *
+// REPEAT_SIZE bytes). The overlapping min(n_old, n_new) units are overwritten in
+// place, so an indel only allocates or frees the |delta| units it adds or
+// removes, then shifts the tail once. `seq` may be NULL when n_new == 0 (pure
+// deletion).
 static void replace_units_range(RepeatArray *arr, int start, int end,
                                 const char *seq, int n_new) {
     int n_old = end - start;
     int delta = n_new - n_old;
+    int n_keep = n_old < n_new ? n_old : n_new;
 
-    for (int i = start; i < end; i++) free(arr->units[i]);
+    for (int i = 0; i < n_keep; i++) {
+        memcpy(arr->units[start + i], seq + (size_t)i * REPEAT_SIZE, REPEAT_SIZE);
+        UNIT_HASH(arr->units[start + i]) = 0;
+    }
+    for (int i = start + n_keep; i < end; i++) free_unit(arr, arr->units[i]);
 
     if (delta > 0) array_ensure_capacity(arr, arr->num_units + delta);
 
@@ -227,13 +321,25 @@ static void replace_units_range(RepeatArray *arr, int start, int end,
     memmove(&arr->units[start + n_new], &arr->units[end],
             (arr->num_units - end) * sizeof(char *));
 
-    for (int i = 0; i < n_new; i++) {
-        arr->units[start + i] = alloc_unit(seq + (size_t)i * REPEAT_SIZE);
+    for (int i = n_keep; i < n_new; i++) {
+        arr->units[start + i] = alloc_unit(arr, seq + (size_t)i * REPEAT_SIZE);
     }
 
     arr->num_units += delta;
 }
 
+// Scratch buffer of at least `len` bytes, kept across events: indels happen every
+// generation, and reusing one grow-only buffer avoids a malloc/free per event.
+static char *array_scratch(RepeatArray *arr, long len) {
+    if (len > arr->scratch_capacity) {
+        long cap = arr->scratch_capacity > 0 ? arr->scratch_capacity : 64L * REPEAT_SIZE;
+        while (cap < len) cap *= 2;
+        arr->scratch = (char *)realloc(arr->scratch, cap);
+        arr->scratch_capacity = cap;
+    }
+    return arr->scratch;
+}
+
 // Copy base-pair range [a, b) out of the unit array into dst. Returns bytes written.
 static long gather_bytes(char *dst, char **units, long a, long b) {
     long w = 0;
@@ -260,14 +366,13 @@ static void duplicate_at_position(RepeatArray *arr, long char_start, long char_e
     long region_hi = (long)unit_end * rs;
     long new_len = (region_hi - region_lo) + (char_end - char_start);  // multiple of rs
 
-    char *buf = (char *)malloc(new_len);
+    char *buf = array_scratch(arr, new_len);
     long w = 0;
     w += gather_bytes(buf + w, arr->units, region_lo, char_end);   // before + original segment
     w += gather_bytes(buf + w, arr->units, char_start, char_end);  // tandem copy
     w += gather_bytes(buf + w, arr->units, char_end, region_hi);   // after
 
     replace_units_range(arr, unit_start, unit_end, buf, (int)(new_len / rs));
-    free(buf);
 }
 
 // Delete the base-pair window [char_start, char_end) (size a multiple of
@@ -285,55 +390,101 @@ static void delete_at_position(RepeatArray *arr, long char_start, long char_end)
         replace_units_range(arr, unit_start, unit_end, NULL, 0);
         return;
     }
-    char *buf = (char *)malloc(new_len);
+    char *buf = array_scratch(arr, new_len);
     long w = 0;
     w += gather_bytes(buf + w, arr->units, region_lo, char_start);  // kept head
     w += gather_bytes(buf + w, arr->units, char_end, region_hi);    // kept tail
     replace_units_range(arr, unit_start, unit_end, buf, (int)(new_len / rs));
-    free(buf);
 }
 
 // ============================================================================
 // Mutation functions
 // ============================================================================
 
+// For each base (indexed as in BASES), the three bases it can mutate to. A SNP
+// picks one of three uniformly: a single draw, no rejection loop.
+static const char OTHER_BASES[4][3] = {
+    {'C', 'G', 'T'},
+    {'A', 'G', 'T'},
+    {'A', 'C', 'T'},
+    {'A', 'C', 'G'},
+};
+static const unsigned char BASE_INDEX[256] = { ['A'] = 0, ['C'] = 1, ['G'] = 2, ['T'] = 3 };
+
 static void apply_snps(Simulation *sim) {
     unsigned int *rng = &sim->rng_state;
-    int n_snps = sample_count(rng, sim->params.count_dist, sim->params.snp_rate, sim->params.nb_dispersion);
+    int n_snps = sample_event_count(sim, &sim->snp_poisson, sim->params.snp_rate);
+    if (n_snps == 0 || sim->array.num_units == 0) return;
 
-    for (int i = 0; i < n_snps; i++) {
-        if (sim->array.num_units == 0) break;
+    // SNPs don't change the array length, so the base-pair span is fixed for the
+    // whole batch. One uniform draw over it picks unit and position together.
+    long total_bp = (long)sim->array.num_units * REPEAT_SIZE;
 
-        // Pick random unit and position
-        int unit_idx = rng_int(rng, sim->array.num_units);
-        int pos = rng_int(rng, REPEAT_SIZE);
+    // Work on local copies of the unit table and RNG state: the base writes go
+    // through char pointers, which may alias anything, so reading these through
+    // `sim` would force a reload of both on every iteration.
+    char **units = sim->array.units;
+    unsigned int state = *rng;
 
-        char *unit = sim->array.units[unit_idx];
-        char old_base = unit[pos];
+    for (int i = 0; i < n_snps; i++) {
+        // Unsigned position: the divide/modulo by the constant REPEAT_SIZE then
+        // lowers to a single multiply-shift with no sign fixup
+        unsigned long bp = rng_index(&state, (unsigned long)total_bp);
+        char *unit = units[bp / REPEAT_SIZE];
+        unsigned int pos = (unsigned int)(bp % REPEAT_SIZE);
+        unsigned char old_base = (unsigned char)unit[pos];
 
         // Pick a different base
-        char new_base;
-        do {
-            new_base = BASES[rng_int(rng, 4)];
-        } while (new_base == old_base);
-
-        unit[pos] = new_base;
-        sim->stats.snp_count++;
+        unit[pos] = OTHER_BASES[BASE_INDEX[old_base]][rng_int(&state, 3)];
+        UNIT_HASH(unit) = 0;
     }
+
+    *rng = state;
+    sim->stats.snp_count += n_snps;
 }
 
 static void apply_indels(Simulation *sim) {
     unsigned int *rng = &sim->rng_state;
-    int n_indels = sample_count(rng, sim->params.count_dist, sim->params.indel_rate, sim->params.nb_dispersion);
+    int n_indels = sample_event_count(sim, &sim->indel_poisson, sim->params.indel_rate);
+
+    // Local copy of the params: the unit copies in duplicate/delete write through
+    // char pointers, so reading sim->params inside the loop would reload each
+    // field after every applied event.
+    const SimParams p = sim->params;
+
+    // Per-generation constants, computed once for the whole batch of events: the
+    // base dup/del log-odds and the dup/del mean sizes depend only on params.
+    float base = p.dup_bias;
+    if (base < 1e-6f) base = 1e-6f; else if (base > 1.0f - 1e-6f) base = 1.0f - 1e-6f;
+    float base_logit = (n_indels > 0) ? logf(base / (1.0f - base)) : 0.0f;
+
+    // Split the mean event size between dups and dels by the size ratio r, kept
+    // log-symmetric around the central lambda: dup ~ lambda*sqrt(r), del ~
+    // lambda/sqrt(r). r == 1 leaves both at lambda (size-symmetric, the default).
+    float dup_size_mean = p.indel_size_lambda;
+    float del_size_mean = p.indel_size_lambda;
+    float ratio = p.dup_del_size_ratio;
+    if (n_indels > 0 && ratio > 0.0f && ratio != 1.0f) {
+        float sr = sqrtf(ratio);
+        dup_size_mean *= sr;
+        del_size_mean /= sr;
+    }
+
+    // Event tallies for this generation, folded into stats once after the loop
+    int  dup_count = 0, del_count = 0;
+    long dup_units = 0, del_units = 0;
+
+    // Array length, tracked locally and updated by each applied event
+    int cur_units = sim->array.num_units;
 
     for (int i = 0; i < n_indels; i++) {
-        if (sim->array.num_units == 0) {
+        if (cur_units == 0) {
             sim->stats.collapsed = true;
-            return;
+            break;
         }
 
         // Start with base dup/del bias
-        float dup_prob = sim->params.dup_bias;
+        float dup_prob = p.dup_bias;
 
         // Elastic bounding: a restoring force toward target_size, applied in
         // log-odds (logit) space so it shifts the dup:del frequency RATIO
@@ -348,37 +499,27 @@ static void apply_indels(Simulation *sim) {
         // at deviation 0 (so the coupling stays drift-free), and any push keeps a
         // valid probability. The 4x factor matches the old linear response slope at
         // the symmetric point (r = 1, base = 0.5).
-        if (sim->params.elasticity > 0.0f) {
-            float deviation = (float)(sim->array.num_units - sim->params.target_size)
-                            / (float)sim->params.target_size;
-            float base = dup_prob;
-            if (base < 1e-6f) base = 1e-6f; else if (base > 1.0f - 1e-6f) base = 1.0f - 1e-6f;
-            float logit = logf(base / (1.0f - base)) - 4.0f * sim->params.elasticity * deviation;
+        if (p.elasticity > 0.0f) {
+            float deviation = (float)(cur_units - p.target_size)
+                            / (float)p.target_size;
+            float logit = base_logit - 4.0f * p.elasticity * deviation;
             dup_prob = 1.0f / (1.0f + expf(-logit));
         }
 
         // Choose duplication or deletion based on biased probability
         bool is_dup = rng_float(rng) < dup_prob;
 
-        // Split the mean event size between dups and dels by the size ratio r, kept
-        // log-symmetric around the central lambda: dup ~ lambda*sqrt(r), del ~
-        // lambda/sqrt(r). r == 1 leaves both at lambda (size-symmetric, the default).
-        float size_mean = sim->params.indel_size_lambda;
-        float ratio = sim->params.dup_del_size_ratio;
-        if (ratio > 0.0f && ratio != 1.0f) {
-            float sr = sqrtf(ratio);
-            size_mean = is_dup ? size_mean * sr : size_mean / sr;
-        }
+        float size_mean = is_dup ? dup_size_mean : del_size_mean;
 
         // Sample size in repeat units (>=1), then convert to base pairs. The event
         // size is a whole multiple of REPEAT_SIZE so the frame is preserved, but the
         // START is an arbitrary base position (mid-unit), which produces chimeric
         // units at the junctions -- this is the dominant source of sequence
         // diversity, matching censim's arbitrary-position indels.
-        int indel_units = sample_size(rng, sim->params.size_dist, size_mean, sim->params.power_law_alpha);
+        int indel_units = sample_size(rng, p.size_dist, size_mean, p.power_law_alpha);
         if (indel_units < 1) continue;  // 0-size = no-op; keeps E[size] == size_mean (drift-free coupling)
 
-        long total_bp = (long)sim->array.num_units * REPEAT_SIZE;
+        long total_bp = (long)cur_units * REPEAT_SIZE;
         long span = (long)indel_units * REPEAT_SIZE;
 
         // Place the whole event inside the array by drawing the start from the valid
@@ -389,34 +530,41 @@ static void apply_indels(Simulation *sim) {
         // event is bigger than the whole array it just can't be placed (only happens
         // near collapse, where it harmlessly acts as a floor).
         if (span >= total_bp) continue;
-        long char_start = rng_int(rng, (int)(total_bp - span));
+        long char_start = (long)rng_index(rng, (unsigned long)(total_bp - span));
         long char_end = char_start + span;
 
         if (is_dup) {
             // Check max size
-            if (sim->params.bounding_enabled &&
-                sim->array.num_units + indel_units > sim->params.max_array_size) {
+            if (p.bounding_enabled &&
+                cur_units + indel_units > p.max_array_size) {
                 continue;
             }
             duplicate_at_position(&sim->array, char_start, char_end);
-            sim->stats.dup_count++;
-            sim->stats.dup_units += indel_units;  // measured (post-checks) size
+            cur_units += indel_units;
+            dup_count++;
+            dup_units += indel_units;  // measured (post-checks) size
         } else {
             // Check min size
-            if (sim->params.bounding_enabled &&
-                sim->array.num_units - indel_units < sim->params.min_array_size) {
+            if (p.bounding_enabled &&
+                cur_units - indel_units < p.min_array_size) {
                 continue;
             }
             delete_at_position(&sim->array, char_start, char_end);
-            sim->stats.del_count++;
-            sim->stats.del_units += indel_units;  // measured (post-checks) size
+            cur_units -= indel_units;
+            del_count++;
+            del_units += indel_units;  // measured (post-checks) size
         }
     }
 
+    sim->stats.dup_count += dup_count;
+    sim->stats.del_count += del_count;
+    sim->stats.dup_units += dup_units;
+    sim->stats.del_units += del_units;
+
     // Check for collapse (independent of hard bounds; with hard bounds enabled the
     // array can't drop below min_array_size so this won't fire, matching the paper's
     // unbounded drift-to-collapse behaviour when bounding is off).
-    if (sim->array.num_units < sim->params.collapse_threshold) {
+    if (cur_units < p.collapse_threshold) {
         sim->stats.collapsed = true;
     }
 }
@@ -428,13 +576,15 @@ static void apply_indels(Simulation *sim) {
 void sim_init(Simulation *sim, int initial_size, unsigned int seed) {
     // Seed per-trajectory RNG. Avoid 0 (xorshift fixed point).
     sim->rng_state = seed ? seed : 0x9E3779B9u;
+    sim->snp_poisson = (PoissonCache){ -1.0f, 0.0f };
+    sim->indel_poisson = (PoissonCache){ -1.0f, 0.0f };
 
     // Initialize array
     array_init(&sim->array, initial_size * 2);  // Extra capacity
 
     // Fill with copies of default monomer
     for (int i = 0; i < initial_size; i++) {
-        sim->array.units[i] = alloc_unit(DEFAULT_MONOMER);
+        sim->array.units[i] = alloc_unit(&sim->array, DEFAULT_MONOMER);
     }
     sim->array.num_units = initial_size;
 
@@ -457,13 +607,7 @@ void sim_init(Simulation *sim, int initial_size, unsigned int seed) {
     sim->params.power_law_alpha = 2.5f;  // Shape parameter (lower = heavier tail)
 
     // Reset stats
-    sim->stats.generation = 0;
-    sim->stats.snp_count = 0;
-    sim->stats.dup_count = 0;
-    sim->stats.del_count = 0;
-    sim->stats.dup_units = 0;
-    sim->stats.del_units = 0;
-    sim->stats.collapsed = false;
+    sim->stats = (SimStats){ 0 };
 }
 
 void sim_free(Simulation *sim) {
@@ -494,22 +638,17 @@ void sim_reset(Simulation *sim) {
     array_init(&sim->array, initial_size * 2);
 
     for (int i = 0; i < initial_size; i++) {
-        sim->array.units[i] = alloc_unit(DEFAULT_MONOMER);
+        sim->array.units[i] = alloc_unit(&sim->array, DEFAULT_MONOMER);
     }
     sim->array.num_units = initial_size;
 
     // Reset stats but keep params
-    sim->stats.generation = 0;
-    sim->stats.snp_count = 0;
-    sim->stats.dup_count = 0;
-    sim->stats.del_count = 0;
-    sim->stats.dup_units = 0;
-    sim->stats.del_units = 0;
-    sim->stats.collapsed = false;
+    sim->stats = (SimStats){ 0 };
 }
 
-// Simple hash-based unique counting using FNV-1a
-static unsigned int hash_sequence(const char *seq) {
+// FNV-1a over one unit. The single unit hash for the whole program: unique
+// counts, HOR block uniqueness and the colour cache all key on it.
+unsigned int sim_hash_unit(const char *seq) {
     unsigned int hash = 2166136261u;
     for (int i = 0; i < REPEAT_SIZE; i++) {
         hash ^= (unsigned char)seq[i];
@@ -518,22 +657,59 @@ static unsigned int hash_sequence(const char *seq) {
     return hash;
 }
 
+// Hashes are cached in each unit block and cleared by every write to the unit,
+// so only units touched since the last call are rehashed -- per redraw that is
+// the handful an indel or SNP rewrote, not the whole array. A unit whose hash
+// really is 0 just misses the cache.
+void sim_hash_units(Simulation *sim, unsigned int *out) {
+    char **units = sim->array.units;
+    for (int i = 0; i < sim->array.num_units; i++) {
+        unsigned int h = UNIT_HASH(units[i]);
+        if (h == 0) {
+            h = sim_hash_unit(units[i]);
+            UNIT_HASH(units[i]) = h;
+        }
+        out[i] = h;
+    }
+}
+
 int sim_count_unique(Simulation *sim) {
     if (sim->array.num_units == 0) return 0;
 
-    // Use a simple hash set
-    int table_size = sim->array.num_units * 2;
+    unsigned int *hashes = (unsigned int *)malloc(sim->array.num_units * sizeof(unsigned int));
+    sim_hash_units(sim, hashes);
+    int unique = sim_count_unique_hashes(hashes, sim->array.num_units);
+    free(hashes);
+    return unique;
+}
+
+int sim_count_unique_hashes(const unsigned int *hashes, int n) {
+    if (n == 0) return 0;
+
+    // Use a simple hash set, sized to a power of two >= 2n so probes can mask
+    // instead of divide. 0 marks an empty slot, so hash 0 is tracked separately.
+    unsigned int table_size = 16;
+    while (table_size < (unsigned int)n * 2) table_size <<= 1;
+    unsigned int mask = table_size - 1;
     unsigned int *seen = (unsigned int *)calloc(table_size, sizeof(unsigned int));
     int unique = 0;
-
-    for (int i = 0; i < sim->array.num_units; i++) {
-        unsigned int hash = hash_sequence(sim->array.units[i]);
-        unsigned int idx = hash % table_size;
+    bool seen_zero = false;
+
+    for (int i = 0; i < n; i++) {
+        unsigned int hash = hashes[i];
+        // Runs of identical (tandem-duplicated) units: only the first can be new
+        if (i > 0 && hash == hashes[i - 1]) continue;
+        if (hash == 0) {
+            if (!seen_zero) unique++;
+            seen_zero = true;
+            continue;
+        }
+        unsigned int idx = hash & mask;
 
         // Linear probing
         while (seen[idx] != 0) {
             if (seen[idx] == hash) break;  // Collision assumed same (imperfect)
-            idx = (idx + 1) % table_size;
+            idx = (idx + 1) & mask;
         }
 
         if (seen[idx] == 0) {
@@ -23,11 +23,26 @@ typedef struct SimParams SimParams;
 typedef struct SimStats SimStats;
 typedef struct Simulation Simulation;
 
+// expf(-lambda) for a Poisson rate, recomputed only when the rate changes
+typedef struct {
+    float lambda;
+    float exp_neg_lambda;
+} PoissonCache;
+
 // Repeat array - dynamic array of 178-char sequences
 struct RepeatArray {
     char **units;       // Array of pointers to sequences
     int num_units;      // Current count
     int capacity;       // Allocated capacity
+    // Unit storage: fixed-size blocks carved from large slabs and recycled via a
+    // free list, so indels don't malloc/free every unit they touch.
+    char **slabs;
+    int num_slabs;
+    int slabs_capacity;
+    char *free_units;   // Free list, linked through each free block's first bytes
+    // Reusable byte buffer for rebuilding the region an indel touches
+    char *scratch;
+    long scratch_capacity;
 };
 
 // Simulation parameters
@@ -68,6 +83,8 @@ struct Simulation {
     SimParams params;
     SimStats stats;
     unsigned int rng_state;  // Per-trajectory RNG state (thread-safe, independent)
+    PoissonCache snp_poisson;    // Per-generation event-count samplers
+    PoissonCache indel_poisson;
 };
 
 // Public API
@@ -79,6 +96,13 @@ void sim_reset(Simulation *sim);
 
 // Statistics
 int sim_count_unique(Simulation *sim);
+// FNV-1a hash of one unit / every unit into out[0..num_units). The same hash
+// keys the colorizer cache, so one pass can feed both the unique count and the colours.
+// sim_hash_units reuses per-unit hashes cached in the array (and writes new ones
+// back to it), recomputing only units written since the previous call.
+unsigned int sim_hash_unit(const char *seq);
+void sim_hash_units(Simulation *sim, unsigned int *out);
+int sim_count_unique_hashes(const unsigned int *hashes, int n);
 float sim_diversity(Simulation *sim);
 
 #endif // SIMULATION_H